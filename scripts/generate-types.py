@@ -4,9 +4,13 @@ Generate TypeScript types from Pydantic models
 Ensures frontend and backend types stay in sync
 """
 
+import hashlib
+import io
 import json
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import get_type_hints, get_origin, get_args
+from typing import TextIO, get_type_hints, get_origin, get_args
 from datetime import datetime
 from enum import Enum
 import sys
@@ -17,32 +21,67 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from models import types as model_types
 
+# Generated output cached by content hash of the model and generator sources
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "generate-types"
+
+
+# Fast path for the primitive types that make up most fields
+_PRIMITIVE_MAP = {
+    type(None): "null",
+    str: "string",
+    int: "number",
+    float: "number",
+    bool: "boolean",
+    datetime: "Date",
+}
+
 
 def python_type_to_typescript(py_type) -> str:
-    """Convert Python type to TypeScript type"""
+    """Convert Python type to TypeScript type (memoized per distinct type)"""
+    try:
+        primitive = _PRIMITIVE_MAP.get(py_type)
+        if primitive is not None:
+            return primitive
+        return _cached_type_to_typescript(py_type)
+    except TypeError:
+        # Unhashable type arguments (e.g. exotic Literal values) can't be cached
+        return _type_to_typescript(py_type)
+
+
+@lru_cache(maxsize=None)
+def _cached_type_to_typescript(py_type) -> str:
+    """Cached conversion - each distinct type object is converted once"""
+    return _type_to_typescript(py_type)
 
-    # Handle None/Optional
-    if py_type is type(None):
-        return "null"
 
-    # Handle primitives
-    if py_type is str:
-        return "string"
-    if py_type in (int, float):
-        return "number"
-    if py_type is bool:
-        return "boolean"
-    if py_type is datetime:
-        return "Date"
+@lru_cache(maxsize=None)
+def _origin_args(py_type) -> tuple:
+    """Return (get_origin, get_args) for a type, introspected once per type"""
+    return get_origin(py_type), get_args(py_type)
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model_class) -> tuple:
+    """Snapshot (name, annotation, required) for each Pydantic v2 model field"""
+    return tuple(
+        (field_name, field_info.annotation, field_info.is_required())
+        for field_name, field_info in model_class.model_fields.items()
+    )
+
+
+def _type_to_typescript(py_type) -> str:
+    """Convert non-primitive Python type to TypeScript type"""
 
     # Handle Optional (Union with None)
-    origin = get_origin(py_type)
+    try:
+        origin, args = _origin_args(py_type)
+    except TypeError:
+        origin, args = get_origin(py_type), get_args(py_type)
     if origin is type(None):
         return "null"
 
     # Handle Union types (including Optional)
     if origin in (type("|"), type(None)):
-        args = get_args(py_type)
         if len(args) == 2 and type(None) in args:
             # Optional type
             non_none = [a for a in args if a is not type(None)][0]
@@ -53,21 +92,18 @@ def python_type_to_typescript(py_type) -> str:
 
     # Handle List
     if origin is list:
-        args = get_args(py_type)
         if args:
             return f"Array<{python_type_to_typescript(args[0])}>"
         return "Array<any>"
 
     # Handle Dict
     if origin is dict:
-        args = get_args(py_type)
         if len(args) == 2:
             return f"Record<{python_type_to_typescript(args[0])}, {python_type_to_typescript(args[1])}>"
         return "Record<string, any>"
 
     # Handle Literal
     if hasattr(py_type, "__origin__") and str(py_type.__origin__) == "typing.Literal":
-        args = get_args(py_type)
         return " | ".join(f'"{arg}"' if isinstance(arg, str) else str(arg) for arg in args)
 
     # Handle Enums
@@ -82,54 +118,52 @@ def python_type_to_typescript(py_type) -> str:
     return "any"
 
 
-def generate_enum(enum_class) -> str:
-    """Generate TypeScript enum"""
-    lines = [f"export enum {enum_class.__name__} {{"]
+def generate_enum(enum_class, out: TextIO) -> None:
+    """Write TypeScript enum to the output buffer"""
+    out.write(f"export enum {enum_class.__name__} {{\n")
     for member in enum_class:
-        lines.append(f"  {member.name} = \"{member.value}\",")
-    lines.append("}")
-    return "\n".join(lines)
+        out.write(f"  {member.name} = \"{member.value}\",\n")
+    out.write("}\n")
 
 
-def generate_interface(model_class) -> str:
-    """Generate TypeScript interface from Pydantic model"""
-    lines = [f"export interface {model_class.__name__} {{"]
+def generate_interface(model_class, out: TextIO) -> None:
+    """Write TypeScript interface from Pydantic model to the output buffer"""
+    out.write(f"export interface {model_class.__name__} {{\n")
 
     # Get field annotations
     if hasattr(model_class, "model_fields"):
         # Pydantic v2
-        for field_name, field_info in model_class.model_fields.items():
-            ts_type = python_type_to_typescript(field_info.annotation)
-            optional = "?" if not field_info.is_required() else ""
-            lines.append(f"  {field_name}{optional}: {ts_type};")
+        for field_name, annotation, required in _model_fields(model_class):
+            ts_type = python_type_to_typescript(annotation)
+            optional = "?" if not required else ""
+            out.write(f"  {field_name}{optional}: {ts_type};\n")
     else:
         # Fallback to __annotations__
         annotations = getattr(model_class, "__annotations__", {})
         for field_name, field_type in annotations.items():
             ts_type = python_type_to_typescript(field_type)
-            lines.append(f"  {field_name}: {ts_type};")
+            out.write(f"  {field_name}: {ts_type};\n")
 
-    lines.append("}")
-    return "\n".join(lines)
+    out.write("}\n")
 
 
 def generate_typescript_file():
     """Generate complete TypeScript file"""
-    output = []
+    out = io.StringIO()
 
     # Header
-    output.append("/**")
-    output.append(" * PedalBuild Type Definitions")
-    output.append(" * AUTO-GENERATED from Python Pydantic models")
-    output.append(" * DO NOT EDIT MANUALLY - Run: npm run generate:types")
-    output.append(" */")
-    output.append("")
+    out.write("/**\n")
+    out.write(" * PedalBuild Type Definitions\n")
+    out.write(" * AUTO-GENERATED from Python Pydantic models\n")
+    out.write(" * DO NOT EDIT MANUALLY - Run: npm run generate:types\n")
+    out.write(" */\n")
+    out.write("\n")
 
     # Enums
-    output.append("// ============================================================================")
-    output.append("// ENUMS")
-    output.append("// ============================================================================")
-    output.append("")
+    out.write("// ============================================================================\n")
+    out.write("// ENUMS\n")
+    out.write("// ============================================================================\n")
+    out.write("\n")
 
     enums = [
         model_types.ComponentType,
@@ -141,66 +175,80 @@ def generate_typescript_file():
     ]
 
     for enum_class in enums:
-        output.append(generate_enum(enum_class))
-        output.append("")
+        generate_enum(enum_class, out)
+        out.write("\n")
 
     # Interfaces
-    output.append("// ============================================================================")
-    output.append("// INTERFACES")
-    output.append("// ============================================================================")
-    output.append("")
+    out.write("// ============================================================================\n")
+    out.write("// INTERFACES\n")
+    out.write("// ============================================================================\n")
+    out.write("\n")
 
     # Get all Pydantic models from types module
-    models = []
-    for name in dir(model_types):
-        obj = getattr(model_types, name)
-        if (isinstance(obj, type) and
-            hasattr(obj, "model_fields") and
-            not name.startswith("_")):
-            models.append(obj)
+    models = [
+        obj
+        for name, obj in vars(model_types).items()
+        if not name.startswith("_") and isinstance(obj, type) and hasattr(obj, "model_fields")
+    ]
 
     # Sort models for consistent output
-    models.sort(key=lambda m: m.__name__)
+    models.sort(key=attrgetter("__name__"))
 
     for model_class in models:
-        output.append(generate_interface(model_class))
-        output.append("")
+        generate_interface(model_class, out)
+        out.write("\n")
 
     # Union types for stage data
-    output.append("// ============================================================================")
-    output.append("// UNION TYPES")
-    output.append("// ============================================================================")
-    output.append("")
-    output.append("export type StageData =")
-    output.append("  | InspirationData")
-    output.append("  | SpecDownloadData")
-    output.append("  | SchematicAnalysisData")
-    output.append("  | InventoryCheckData")
-    output.append("  | BOMGenerationData")
-    output.append("  | BreadboardLayoutData")
-    output.append("  | PrototypeTestingData")
-    output.append("  | FinalAssemblyData")
-    output.append("  | GraphicsDesignData")
-    output.append("  | ShowcaseData;")
-    output.append("")
-
-    return "\n".join(output)
+    out.write("// ============================================================================\n")
+    out.write("// UNION TYPES\n")
+    out.write("// ============================================================================\n")
+    out.write("\n")
+    out.write("export type StageData =\n")
+    out.write("  | InspirationData\n")
+    out.write("  | SpecDownloadData\n")
+    out.write("  | SchematicAnalysisData\n")
+    out.write("  | InventoryCheckData\n")
+    out.write("  | BOMGenerationData\n")
+    out.write("  | BreadboardLayoutData\n")
+    out.write("  | PrototypeTestingData\n")
+    out.write("  | FinalAssemblyData\n")
+    out.write("  | GraphicsDesignData\n")
+    out.write("  | ShowcaseData;\n")
+
+    return out.getvalue()
+
+
+def cache_key() -> str:
+    """Hash types.py, this generator and the Python version into a cache key"""
+    digest = hashlib.sha256()
+    digest.update(Path(model_types.__file__).read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    digest.update(sys.version.encode("utf-8"))
+    return digest.hexdigest()
 
 
 def main():
     """Main function"""
     print("🔄 Generating TypeScript types from Python Pydantic models...")
 
-    # Generate TypeScript
-    ts_content = generate_typescript_file()
+    # Reuse the previous output when neither the models nor the generator changed
+    cache_path = CACHE_DIR / f"{cache_key()}.ts"
+    if cache_path.exists():
+        ts_bytes = cache_path.read_bytes()
+        print("⚡ Models unchanged - using cached output")
+    else:
+        # Generate TypeScript
+        ts_bytes = generate_typescript_file().encode("utf-8")
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(ts_bytes)
 
     # Write to file
     output_path = Path(__file__).parent.parent / "src" / "models" / "types.generated.ts"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(ts_content)
+    output_path.write_bytes(ts_bytes)
 
     # Count lines
-    line_count = len(ts_content.split("\n"))
+    line_count = ts_bytes.count(b"\n") + 1
 
     print(f"✅ Generated {line_count} lines of TypeScript")
     print(f"📝 Output: {output_path}")
@@ -84,7 +84,7 @@ def create_database(force: bool = False) -> bool:
         return False
 
     logger.info(f"Reading schema from {SCHEMA_PATH}")
-    schema_sql = SCHEMA_PATH.read_text(encoding="utf-8")
+    schema_sql = SCHEMA_PATH.read_bytes().decode("utf-8")
 
     # Create database directory if needed
     DB_DIR.mkdir(parents=True, exist_ok=True)
@@ -102,28 +102,27 @@ def create_database(force: bool = False) -> bool:
         cursor.executescript(schema_sql)
         conn.commit()
 
-        # Verify tables were created
+        # Verify tables, views and triggers were created (single query)
         cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            "SELECT type, name FROM sqlite_master "
+            "WHERE type IN ('table', 'view', 'trigger') AND name NOT LIKE 'sqlite_%'"
         )
-        tables = cursor.fetchall()
-        table_names = [t[0] for t in tables]
+        objects: dict[str, list[str]] = {"table": [], "view": [], "trigger": []}
+        for obj_type, name in cursor.fetchall():
+            objects[obj_type].append(name)
 
-        logger.info(f"Successfully created {len(tables)} tables:")
+        table_names = objects["table"]
+        logger.info(f"Successfully created {len(table_names)} tables:")
         for name in sorted(table_names):
             logger.info(f"  - {name}")
 
-        # Verify views were created
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='view'")
-        views = cursor.fetchall()
+        views = objects["view"]
         if views:
             logger.info(f"Created {len(views)} views:")
             for view in views:
-                logger.info(f"  - {view[0]}")
+                logger.info(f"  - {view}")
 
-        # Verify triggers were created
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
-        triggers = cursor.fetchall()
+        triggers = objects["trigger"]
         if triggers:
             logger.info(f"Created {len(triggers)} triggers")
 
@@ -5,9 +5,22 @@ Ensures types haven't drifted or been manually edited
 """
 
 import difflib
+import re
 from pathlib import Path
 import sys
 
+DIFF_CONTEXT_LINES = 3
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(,\d+)? \+(\d+)(,\d+)? @@")
+
+
+def offset_hunk_header(line: str, offset: int) -> str:
+    """Shift hunk line numbers of a windowed diff back to file positions"""
+    return HUNK_HEADER.sub(
+        lambda m: f"@@ -{int(m[1]) + offset}{m[2] or ''} +{int(m[3]) + offset}{m[4] or ''} @@",
+        line,
+    )
+
 
 def validate_types():
     """Check that committed types match generated types"""
@@ -23,15 +36,15 @@ def validate_types():
 
     if not committed_path.exists():
         print("⚠️  types.ts not found, copying generated version...")
-        committed_path.write_text(generated_path.read_text())
+        committed_path.write_bytes(generated_path.read_bytes())
         print("✅ Created types.ts from generated types")
         return True
 
-    # Compare files
-    generated = generated_path.read_text()
-    committed = committed_path.read_text()
+    # Compare raw bytes first - the common in-sync case never decodes
+    generated_bytes = generated_path.read_bytes()
+    committed_bytes = committed_path.read_bytes()
 
-    if generated == committed:
+    if generated_bytes == committed_bytes:
         print("✅ TypeScript types are in sync with Python models")
         return True
     else:
@@ -39,15 +52,47 @@ def validate_types():
         print("\nDifferences:")
         print("=" * 80)
 
+        committed_lines = committed_bytes.decode("utf-8").splitlines(keepends=True)
+        generated_lines = generated_bytes.decode("utf-8").splitlines(keepends=True)
+
+        # Lines shared at the start and end of both files can't differ; diff only
+        # what lies between them, plus the context lines around each end
+        first_diff = next(
+            (
+                i
+                for i, (committed_line, generated_line) in enumerate(
+                    zip(committed_lines, generated_lines)
+                )
+                if committed_line != generated_line
+            ),
+            min(len(committed_lines), len(generated_lines)),
+        )
+        committed_rest = committed_lines[first_diff:]
+        generated_rest = generated_lines[first_diff:]
+        common_tail = next(
+            (
+                i
+                for i, (committed_line, generated_line) in enumerate(
+                    zip(reversed(committed_rest), reversed(generated_rest))
+                )
+                if committed_line != generated_line
+            ),
+            min(len(committed_rest), len(generated_rest)),
+        )
+        start = max(0, first_diff - DIFF_CONTEXT_LINES)
+        tail = max(0, common_tail - DIFF_CONTEXT_LINES)
+        print(f"First difference at line {first_diff + 1}")
+
         diff = difflib.unified_diff(
-            committed.splitlines(keepends=True),
-            generated.splitlines(keepends=True),
+            committed_lines[start : len(committed_lines) - tail],
+            generated_lines[start : len(generated_lines) - tail],
             fromfile="types.ts (committed)",
             tofile="types.generated.ts (from Python)",
-            lineterm=""
+            lineterm="",
+            n=DIFF_CONTEXT_LINES,
         )
 
-        diff_lines = list(diff)
+        diff_lines = [offset_hunk_header(line, start) for line in diff]
         for line in diff_lines[:50]:  # Show first 50 lines
             if line.startswith('+'):
                 print(f"\033[92m{line}\033[0m", end="")  # Green
@@ -2,7 +2,8 @@
 Database connection utilities for PedalBuild.
 
 Provides:
-- Connection pooling with context managers
+- Per-thread persistent connections, recycled through a bounded idle pool
+- WAL journaling and connection tuning (see CONNECTION_PRAGMAS)
 - FastAPI dependency injection
 - Transaction management
 - Error handling
@@ -10,7 +11,11 @@ Provides:
 
 import logging
 import sqlite3
+import threading
+import time
+import weakref
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Generator, Optional
 
@@ -20,6 +25,32 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "db" / "pedalbuild.db"
 
+# Per-connection prepared statement cache size (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+# Applied once when each persistent connection is opened. journal_mode=WAL is
+# persisted in the database file: back it up with the sqlite3 ".backup" command
+# (or copy the -wal/-shm files too) rather than copying pedalbuild.db alone.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Connections released by exited worker threads that are kept for reuse; any
+# beyond this are closed. Sized to cover the threadpool's steady-state threads.
+POOL_SIZE = 16
+
+# Seconds a check_health() result is reused before querying the database again
+HEALTH_CHECK_TTL = 2.0
+
+# Conservative bound on bound parameters per statement (SQLITE_MAX_VARIABLE_NUMBER
+# defaults to 999 on SQLite builds older than 3.32)
+MAX_SQL_VARIABLES = 999
+
 
 class DatabaseError(Exception):
     """Base exception for database errors."""
@@ -32,6 +63,11 @@ class Database:
     Database connection manager.
 
     Provides connection pooling, context managers, and thread-safe access.
+
+    Each thread is bound to one connection for its lifetime. When the thread
+    exits (idle threadpool workers are retired after a few seconds) the
+    connection returns to an idle pool and is handed to the next new thread
+    after a liveness ping, instead of being leaked or reopened.
     """
 
     def __init__(self, db_path: Optional[Path] = None):
@@ -48,35 +84,136 @@ class Database:
                 f"Database not found at {self.db_path}. Run 'npm run setup:db' first."
             )
 
+        # One long-lived connection per thread (FastAPI runs sync work in a threadpool)
+        self._local = threading.local()
+        self._connections: set[sqlite3.Connection] = set()
+        self._idle: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        # Cached check_health() result as (healthy, time.monotonic() of check)
+        self._health: tuple[bool, float] | None = None
+
     def get_connection(self) -> sqlite3.Connection:
         """
-        Get a new database connection.
+        Get the calling thread's database connection, binding one on first use.
+
+        A new thread reuses an idle pooled connection when one passes a ping,
+        otherwise a fresh connection is opened.
+
+        Connections run in autocommit mode; get_cursor(commit=True) and
+        transaction() issue explicit BEGIN/COMMIT/ROLLBACK.
 
         Returns:
             SQLite connection with foreign keys enabled and row factory configured.
         """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = self._checkout_idle() or self._open_connection()
+
+        self._local.conn = conn
+        # Hand the connection back to the pool once this thread is gone
+        weakref.finalize(threading.current_thread(), self._release, conn)
+
+        return conn
+
+    @contextmanager
+    def borrow_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Lend out a pooled connection that isn't bound to the calling thread.
+
+        For work that outlives one thread's turn, such as a streaming response
+        whose iterator is advanced from several threadpool threads. The
+        connection is configured like any other and goes back to the idle pool
+        when the block exits.
+
+        Yields:
+            SQLite connection, usable from any thread
+        """
+        conn = self._checkout_idle() or self._open_connection()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection and start tracking it."""
         try:
-            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=CACHED_STATEMENTS,
+            )
 
-            # Enable foreign keys
-            conn.execute("PRAGMA foreign_keys = ON")
+            # Foreign keys, WAL journaling and cache tuning - once per connection
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
 
             # Use Row factory for dict-like access
             conn.row_factory = sqlite3.Row
 
-            return conn
-
         except sqlite3.Error as e:
             logger.error(f"Failed to connect to database: {e}")
+            self._health = None
             raise DatabaseError(f"Database connection failed: {e}") from e
 
+        with self._connections_lock:
+            self._connections.add(conn)
+
+        return conn
+
+    def _checkout_idle(self) -> Optional[sqlite3.Connection]:
+        """Take a live connection from the idle pool, discarding any that fail a ping."""
+        while True:
+            with self._connections_lock:
+                if not self._idle:
+                    return None
+                conn = self._idle.pop()
+
+            try:
+                conn.execute("SELECT 1").fetchone()
+                return conn
+            except sqlite3.Error:
+                self._discard(conn)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return an exited thread's connection to the idle pool, or close it."""
+        with self._connections_lock:
+            if conn in self._connections and len(self._idle) < POOL_SIZE:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.append(conn)
+                return
+
+        self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection and stop tracking it."""
+        with self._connections_lock:
+            self._connections.discard(conn)
+        conn.close()
+
+    def close(self) -> None:
+        """Close every connection opened by this manager, across all threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, set()
+            self._idle = []
+
+        for conn in connections:
+            conn.close()
+
+        self._local = threading.local()
+
     @contextmanager
     def get_cursor(self, commit: bool = False) -> Generator[sqlite3.Cursor, None, None]:
         """
         Context manager for database cursor with automatic cleanup.
 
         Args:
-            commit: If True, commit transaction on success. Rollback on error.
+            commit: If True, run inside a transaction that is committed on
+                success and rolled back on error.
 
         Yields:
             Database cursor
@@ -89,21 +226,29 @@ class Database:
         cursor = conn.cursor()
 
         try:
+            if commit:
+                cursor.execute("BEGIN")
+
             yield cursor
 
             if commit:
-                conn.commit()
+                cursor.execute("COMMIT")
                 logger.debug("Transaction committed")
 
         except sqlite3.Error as e:
-            if commit:
+            if commit and conn.in_transaction:
                 conn.rollback()
                 logger.error(f"Transaction rolled back due to error: {e}")
+            self._health = None
             raise DatabaseError(f"Database operation failed: {e}") from e
 
+        except BaseException:
+            if commit and conn.in_transaction:
+                conn.rollback()
+            raise
+
         finally:
             cursor.close()
-            conn.close()
 
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Cursor, None, None]:
@@ -124,22 +269,28 @@ class Database:
         cursor = conn.cursor()
 
         try:
+            cursor.execute("BEGIN")
             yield cursor
-            conn.commit()
+            cursor.execute("COMMIT")
             logger.debug("Transaction committed")
 
         except Exception as e:
-            conn.rollback()
+            if conn.in_transaction:
+                conn.rollback()
             logger.error(f"Transaction rolled back: {e}")
             raise
 
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
         finally:
             cursor.close()
-            conn.close()
 
     def execute_query(
-        self, query: str, params: tuple = (), fetch_one: bool = False
-    ) -> list[sqlite3.Row] | sqlite3.Row | None:
+        self, query: str, params: tuple = (), fetch_one: bool = False, as_dict: bool = False
+    ) -> list[sqlite3.Row] | sqlite3.Row | list[dict] | dict | None:
         """
         Execute a SELECT query and return results.
 
@@ -147,16 +298,47 @@ class Database:
             query: SQL query
             params: Query parameters
             fetch_one: If True, return single row. If False, return all rows.
+            as_dict: If True, return plain dicts keyed by column name
 
         Returns:
-            Query results as Row objects, single Row, or None
+            Query results as Row objects (or dicts), a single row, or None
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
+        cursor = self.execute_cached(query, params)
+
+        try:
+            if not as_dict:
+                if fetch_one:
+                    return cursor.fetchone()
+                return cursor.fetchall()
 
+            # Column names are read once from the cursor, not per row
+            columns = [desc[0] for desc in cursor.description]
             if fetch_one:
-                return cursor.fetchone()
-            return cursor.fetchall()
+                row = cursor.fetchone()
+                return dict(zip(columns, row)) if row is not None else None
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def execute_cached(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """
+        Execute a statement directly on the thread's connection.
+
+        Reusing the same SQL string lets sqlite3's per-connection statement
+        cache skip re-parsing, so hot queries should be module-level constants.
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            Cursor positioned on the results
+        """
+        try:
+            return self.get_connection().execute(query, params)
+        except sqlite3.Error as e:
+            self._health = None
+            raise DatabaseError(f"Database operation failed: {e}") from e
 
     def execute_update(
         self, query: str, params: tuple = ()
@@ -192,20 +374,94 @@ class Database:
             cursor.executemany(query, params_list)
             return cursor.rowcount
 
+    def bulk_insert(self, table: str, columns: list[str], rows: list[tuple]) -> int:
+        """
+        Insert many rows using multi-row VALUES statements.
+
+        Rows are split into the largest chunk that fits under the SQL variable
+        limit, with the remainder broken into power-of-two chunks, so only a
+        handful of distinct statements are ever prepared per table.
+
+        Args:
+            table: Table name
+            columns: Column names, matching the order of each row tuple
+            rows: Row tuples to insert
+
+        Returns:
+            Number of inserted rows
+        """
+        if not rows:
+            return 0
+
+        column_names = tuple(columns)
+        max_rows = max(1, MAX_SQL_VARIABLES // len(column_names))
+        inserted = 0
+
+        with self.get_cursor(commit=True) as cursor:
+            start = 0
+            remaining = len(rows)
+
+            while remaining:
+                if remaining >= max_rows:
+                    chunk_size = max_rows
+                else:
+                    # Largest power of two that fits in what is left
+                    chunk_size = 1 << (remaining.bit_length() - 1)
+
+                chunk = rows[start : start + chunk_size]
+                params = [value for row in chunk for value in row]
+                cursor.execute(_insert_template(table, column_names, chunk_size), params)
+
+                inserted += cursor.rowcount
+                start += chunk_size
+                remaining -= chunk_size
+
+        return inserted
+
     def check_health(self) -> bool:
         """
         Check if database is accessible and healthy.
 
+        The result is reused for HEALTH_CHECK_TTL seconds so frequent probes
+        don't hit the database; any DatabaseError invalidates it.
+
         Returns:
             True if database is healthy, False otherwise
         """
+        now = time.monotonic()
+        cached = self._health
+        if cached is not None and now - cached[1] < HEALTH_CHECK_TTL:
+            return cached[0]
+
         try:
             with self.get_cursor() as cursor:
                 cursor.execute("SELECT 1")
-                return True
+            healthy = True
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
-            return False
+            healthy = False
+
+        self._health = (healthy, now)
+        return healthy
+
+
+@lru_cache(maxsize=None)
+def _insert_template(table: str, columns: tuple[str, ...], n_rows: int) -> str:
+    """
+    Build a multi-row INSERT statement for a table, columns and row count.
+
+    Raises:
+        ValueError: If the table or a column is not a plain SQL identifier
+    """
+    for name in (table, *columns):
+        if not name.isidentifier():
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+
+    row_placeholder = "(" + ", ".join("?" * len(columns)) + ")"
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+        + ", ".join([row_placeholder] * n_rows)
+    )
 
 
 # Global database instance
@@ -243,35 +499,25 @@ def get_db() -> Generator[Database, None, None]:
         def list_components(db: Database = Depends(get_db)):
             return db.execute_query("SELECT * FROM components")
     """
-    db = get_database()
-    try:
-        yield db
-    except Exception as e:
-        logger.error(f"Database dependency error: {e}")
-        raise
-
-
-def row_to_dict(row: sqlite3.Row) -> dict:
-    """
-    Convert SQLite Row to dictionary.
-
-    Args:
-        row: SQLite Row object
-
-    Returns:
-        Dictionary with column names as keys
-    """
-    return {key: row[key] for key in row.keys()}
+    # The singleton is created during app startup; only fall back to the
+    # lazy initializer when running without the lifespan (e.g. scripts)
+    yield _db_instance or get_database()
 
 
 def rows_to_dicts(rows: list[sqlite3.Row]) -> list[dict]:
     """
     Convert list of SQLite Rows to list of dictionaries.
 
+    Prefer execute_query(..., as_dict=True), which skips the Row objects.
+
     Args:
         rows: List of SQLite Row objects
 
     Returns:
         List of dictionaries
     """
-    return [row_to_dict(row) for row in rows]
+    if not rows:
+        return []
+
+    columns = rows[0].keys()
+    return [dict(zip(columns, row)) for row in rows]
@@ -9,18 +9,24 @@ Main application entry point with:
 - Health check endpoints
 """
 
+import asyncio
+import gzip
+import hashlib
 import logging
+import sqlite3
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Request, status
+import anyio.to_thread
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import Response
 from pydantic import BaseModel
 
-from .db import get_database, DatabaseError
+from .db import Database, DatabaseError, get_database, get_db
+from .responses import ORJSONResponse, etag_matches
 
 # Setup logging
 logging.basicConfig(
@@ -34,6 +40,9 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 TYPES_FILE = PROJECT_ROOT / "src" / "models" / "types.generated.ts"
 
+# Worker threads available to sync (sqlite-backed) route handlers; anyio defaults to 40
+THREADPOOL_SIZE = 64
+
 
 # Response models
 class HealthResponse(BaseModel):
@@ -45,13 +54,38 @@ class HealthResponse(BaseModel):
 
 
 class ErrorResponse(BaseModel):
-    """Error response."""
+    """
+    Error response.
+
+    Documents the error body shape; the exception handlers emit the matching
+    dict directly rather than validating a model per error.
+    """
 
     error: str
     detail: str | None = None
     timestamp: float
 
 
+def register_routes(app: FastAPI) -> None:
+    """
+    Import and register API route modules.
+
+    Called from lifespan startup so importing this module (tests, tooling)
+    doesn't pull in the router graph. Safe to call more than once.
+    """
+    if getattr(app.state, "routes_registered", False):
+        return
+
+    from .routes import bom, import_routes, inventory
+
+    app.include_router(inventory.router, prefix="/api/inventory", tags=["Inventory"])
+    app.include_router(bom.router, prefix="/api/bom", tags=["BOM"])
+    app.include_router(import_routes.router, prefix="/api/import", tags=["Import"])
+
+    app.state.routes_registered = True
+    logger.info("API routes registered successfully")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -61,6 +95,9 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting PedalBuild backend server...")
+    logger.info("Event loop: %s", type(asyncio.get_running_loop()).__module__)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    register_routes(app)
 
     # Verify database connection
     try:
@@ -78,6 +115,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down PedalBuild backend server...")
+    get_database().close()
 
 
 # Create FastAPI app
@@ -86,6 +124,7 @@ app = FastAPI(
     description="Backend API for PedalBuild - Guitar Pedal Building Workflow",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration
@@ -105,48 +144,67 @@ app.add_middleware(
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all HTTP requests with timing."""
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     # Process request
     response = await call_next(request)
 
-    # Calculate duration
-    duration_ms = (time.time() - start_time) * 1000
-
-    # Log request
-    logger.info(
-        f"{request.method} {request.url.path} - {response.status_code} - {duration_ms:.2f}ms"
-    )
+    # Log request (formatting is skipped entirely when INFO is disabled)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "%s %s - %s - %.2fms",
+            request.method,
+            request.url.path,
+            response.status_code,
+            (time.perf_counter() - start_time) * 1000,
+        )
 
     return response
 
 
-# Global exception handler
+# Global exception handlers - routes let these propagate instead of wrapping
+# every handler body in its own try/except
 @app.exception_handler(DatabaseError)
-async def database_error_handler(request: Request, exc: DatabaseError):
-    """Handle database errors."""
+@app.exception_handler(sqlite3.Error)
+async def database_error_handler(request: Request, exc: Exception):
+    """Handle database errors (wrapped, and raw sqlite3 errors from services)."""
     logger.error(f"Database error on {request.url.path}: {exc}")
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
-            error="Database Error",
-            detail=str(exc),
-            timestamp=time.time(),
-        ).model_dump(),
+        content={
+            "error": "Database Error",
+            "detail": str(exc),
+            "timestamp": time.time(),
+        },
+    )
+
+
+@app.exception_handler(ValueError)
+async def value_error_handler(request: Request, exc: ValueError):
+    """Handle invalid input surfaced as ValueError."""
+    logger.warning(f"Bad request on {request.url.path}: {exc}")
+
+    return ORJSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={
+            "error": "Bad Request",
+            "detail": str(exc),
+            "timestamp": time.time(),
+        },
     )
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=exc.detail,
-            detail=None,
-            timestamp=time.time(),
-        ).model_dump(),
+        content={
+            "error": exc.detail,
+            "detail": None,
+            "timestamp": time.time(),
+        },
     )
 
 
@@ -155,26 +213,28 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions."""
     logger.error(f"Unhandled exception on {request.url.path}: {exc}", exc_info=True)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
-            error="Internal Server Error",
-            detail=str(exc) if logger.level == logging.DEBUG else None,
-            timestamp=time.time(),
-        ).model_dump(),
+        content={
+            "error": "Internal Server Error",
+            "detail": str(exc) if logger.level == logging.DEBUG else None,
+            "timestamp": time.time(),
+        },
     )
 
 
-# Health check endpoint
+# Health check endpoint; plain `def` since check_health() blocks on sqlite
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+def health_check(db: Database = Depends(get_db)):
     """
     Health check endpoint.
 
+    Args:
+        db: Database dependency
+
     Returns:
         Server and database health status
     """
-    db = get_database()
     db_healthy = db.check_health()
 
     return HealthResponse(
@@ -196,40 +256,63 @@ async def root():
     }
 
 
+# Cached /api/types payload: (mtime_ns, raw bytes, gzipped bytes, ETag)
+_types_cache: tuple[int, bytes, bytes, str] | None = None
+
+
+def _load_types_payload() -> tuple[bytes, bytes, str]:
+    """
+    Return (raw, gzipped, etag) for TYPES_FILE, rebuilding after regeneration.
+
+    Raises:
+        FileNotFoundError: If the types file has not been generated
+    """
+    global _types_cache
+
+    mtime_ns = TYPES_FILE.stat().st_mtime_ns
+    cached = _types_cache
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2], cached[3]
+
+    raw = TYPES_FILE.read_bytes()
+    compressed = gzip.compress(raw, compresslevel=6)
+    etag = f'"{hashlib.sha256(raw).hexdigest()}"'
+    _types_cache = (mtime_ns, raw, compressed, etag)
+
+    return raw, compressed, etag
+
+
 # Serve auto-generated TypeScript types
 @app.get("/api/types")
-async def get_types():
+async def get_types(request: Request):
     """
     Serve auto-generated TypeScript types.
 
+    The file is read and gzipped once and re-read only when its mtime
+    changes. Clients revalidating with If-None-Match get a 304.
+
     Returns:
         TypeScript type definitions file
     """
-    if not TYPES_FILE.exists():
+    try:
+        raw, compressed, etag = _load_types_payload()
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="TypeScript types file not found. Run 'npm run generate:types' first.",
         )
 
-    return FileResponse(
-        TYPES_FILE,
-        media_type="text/typescript",
-        filename="types.generated.ts",
-    )
-
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
 
-# Import and register route modules
-try:
-    from .routes import inventory, bom, import_routes
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    app.include_router(inventory.router, prefix="/api/inventory", tags=["Inventory"])
-    app.include_router(bom.router, prefix="/api/bom", tags=["BOM"])
-    app.include_router(import_routes.router, prefix="/api/import", tags=["Import"])
-
-    logger.info("API routes registered successfully")
+    headers["Content-Disposition"] = 'attachment; filename="types.generated.ts"'
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=compressed, media_type="text/typescript", headers=headers)
 
-except ImportError as e:
-    logger.warning(f"Some route modules not yet implemented: {e}")
+    return Response(content=raw, media_type="text/typescript", headers=headers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""
+Response classes and HTTP caching helpers shared by the app and its routers.
+"""
+
+import hashlib
+import sqlite3
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+
+# Mutable resources: clients may keep a copy but must revalidate each use
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively."""
+    if isinstance(obj, sqlite3.Row):
+        # Services hand back database rows as-is; emit them as JSON objects
+        return dict(zip(obj.keys(), obj))
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _dumps(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Replaces fastapi.responses.ORJSONResponse (deprecated upstream) and adds a
+    fallback encoder for sqlite3.Row, Decimal and set values. datetime, UUID and dataclasses
+    are handled natively by orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return _dumps(content)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip() for tag in if_none_match.split(",")
+    )
+
+
+def cached_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    media_type: str = "application/json",
+    cache_control: str = REVALIDATE_CACHE_CONTROL,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Serve body with ETag/Cache-Control, or a bare 304 if the client's copy matches.
+    """
+    cache_headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    if headers:
+        cache_headers.update(headers)
+    return Response(content=body, media_type=media_type, headers=cache_headers)
+
+
+def etag_json_response(request: Request, content: Any) -> Response:
+    """
+    Serialize content with orjson and serve it through cached_response().
+
+    The ETag is a hash of the serialized body, so it changes exactly when the
+    payload does.
+    """
+    body = _dumps(content)
+    return cached_response(request, body, make_etag(body))
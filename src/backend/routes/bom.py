@@ -4,22 +4,30 @@ BOM (Bill of Materials) API Routes
 REST endpoints for BOM management and validation.
 """
 
+import itertools
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from ..db import Database, get_db
+from ..responses import ORJSONResponse, etag_json_response
 from ..services.bom_manager import BOMManagerService
+from .deps import bom_service_for
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Handlers are plain `def`: they call blocking sqlite services, so FastAPI runs
+# them in its worker threadpool instead of on the event loop
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # Request/Response models
+# Read endpoints return service dicts serialized with orjson (ETag-tagged where
+# clients can revalidate); the response models below document those payloads in
+# OpenAPI without validating each response.
 class BOMItemResponse(BaseModel):
     """BOM item response model."""
 
@@ -97,11 +105,12 @@ class AddBOMItemRequest(BaseModel):
 
 def get_bom_service(db: Database = Depends(get_db)) -> BOMManagerService:
     """Get BOM service instance."""
-    return BOMManagerService(str(db.db_path))
+    return bom_service_for(db)
 
 
-@router.get("/{circuit_id}", response_model=BOMResponse)
-async def get_bom(
+@router.get("/{circuit_id}", responses={200: {"model": BOMResponse}})
+def get_bom(
+    request: Request,
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
@@ -115,30 +124,20 @@ async def get_bom(
     Returns:
         Complete BOM for the circuit
     """
-    try:
-        items = service.get_bom(circuit_id)
-
-        if not items:
-            # Check if circuit exists by trying to get it
-            # For now, just return empty BOM
-            logger.warning(f"No BOM items found for circuit: {circuit_id}")
-
-        return BOMResponse(
-            circuit_id=circuit_id,
-            items=items,
-            total=len(items),
-        )
+    items = service.get_bom(circuit_id)
 
-    except Exception as e:
-        logger.error(f"Error getting BOM: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    if not items:
+        # Check if circuit exists by trying to get it
+        # For now, just return empty BOM
+        logger.warning(f"No BOM items found for circuit: {circuit_id}")
 
+    return etag_json_response(
+        request, {"circuit_id": circuit_id, "items": items, "total": len(items)}
+    )
 
-@router.get("/{circuit_id}/by-type", response_model=BOMByTypeResponse)
-async def get_bom_by_type(
+
+@router.get("/{circuit_id}/by-type", responses={200: {"model": BOMByTypeResponse}})
+def get_bom_by_type(
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
@@ -152,26 +151,14 @@ async def get_bom_by_type(
     Returns:
         BOM grouped by component type (resistors, capacitors, etc.)
     """
-    try:
-        by_type = service.get_bom_by_type(circuit_id)
-        total = sum(len(items) for items in by_type.values())
-
-        return BOMByTypeResponse(
-            circuit_id=circuit_id,
-            by_type=by_type,
-            total=total,
-        )
+    by_type = service.get_bom_by_type(circuit_id)
+    total = sum(map(len, by_type.values()))
 
-    except Exception as e:
-        logger.error(f"Error getting BOM by type: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    return ORJSONResponse({"circuit_id": circuit_id, "by_type": by_type, "total": total})
 
 
 @router.post("/{circuit_id}/items")
-async def add_bom_item(
+def add_bom_item(
     circuit_id: str,
     request: AddBOMItemRequest,
     service: BOMManagerService = Depends(get_bom_service),
@@ -187,30 +174,20 @@ async def add_bom_item(
     Returns:
         Success status
     """
-    try:
-        item_dict = request.model_dump()
-        success = service.add_bom_item(circuit_id, item_dict)
-
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to add BOM item",
-            )
-
-        return {"success": True, "circuit_id": circuit_id}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error adding BOM item: {e}")
+    item_dict = request.model_dump()
+    success = service.add_bom_item(circuit_id, item_dict)
+
+    if not success:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
+            detail="Failed to add BOM item",
         )
 
+    return {"success": True, "circuit_id": circuit_id}
+
 
-@router.get("/{circuit_id}/validate", response_model=ValidationResponse)
-async def validate_bom(
+@router.get("/{circuit_id}/validate", responses={200: {"model": ValidationResponse}})
+def validate_bom(
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
@@ -226,20 +203,12 @@ async def validate_bom(
     Returns:
         Validation results with matches and missing components
     """
-    try:
-        validation = service.validate_bom(circuit_id)
-        return ValidationResponse(**validation)
+    validation = service.validate_bom(circuit_id)
+    return ORJSONResponse(validation)
 
-    except Exception as e:
-        logger.error(f"Error validating BOM: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
 
-
-@router.get("/{circuit_id}/shopping-list", response_model=ShoppingListResponse)
-async def get_shopping_list(
+@router.get("/{circuit_id}/shopping-list", responses={200: {"model": ShoppingListResponse}})
+def get_shopping_list(
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
@@ -255,20 +224,13 @@ async def get_shopping_list(
     Returns:
         List of components to purchase
     """
-    try:
-        shopping_list = service.get_shopping_list(circuit_id)
-        return ShoppingListResponse(**shopping_list)
+    shopping_list = service.get_shopping_list(circuit_id)
+    return ORJSONResponse(shopping_list)
 
-    except Exception as e:
-        logger.error(f"Error getting shopping list: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
 
-
-@router.get("/{circuit_id}/stats", response_model=BOMStatsResponse)
-async def get_bom_stats(
+@router.get("/{circuit_id}/stats", responses={200: {"model": BOMStatsResponse}})
+def get_bom_stats(
+    request: Request,
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
@@ -282,26 +244,20 @@ async def get_bom_stats(
     Returns:
         Statistics including component counts, critical components, and low confidence items
     """
-    try:
-        stats = service.get_statistics(circuit_id)
-        return BOMStatsResponse(**stats)
-
-    except Exception as e:
-        logger.error(f"Error getting BOM stats: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    stats = service.get_statistics(circuit_id)
+    return etag_json_response(request, stats)
 
 
-@router.get("/{circuit_id}/export", response_class=PlainTextResponse)
-async def export_bom_csv(
+@router.get("/{circuit_id}/export", response_class=StreamingResponse)
+def export_bom_csv(
     circuit_id: str,
     service: BOMManagerService = Depends(get_bom_service),
 ):
     """
     Export BOM to CSV format.
 
+    Rows are streamed from the database as they are formatted.
+
     Args:
         circuit_id: Circuit ID
         service: BOM service dependency
@@ -309,28 +265,20 @@ async def export_bom_csv(
     Returns:
         CSV file as plain text
     """
-    try:
-        csv_content = service.export_bom_csv(circuit_id)
-
-        if not csv_content or csv_content.count("\n") <= 1:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"No BOM found for circuit: {circuit_id}",
-            )
-
-        return PlainTextResponse(
-            content=csv_content,
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=bom_{circuit_id}.csv"
-            },
-        )
+    rows = service.iter_bom_csv_rows(circuit_id)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error exporting BOM: {e}")
+    # The service yields no chunks at all for an empty BOM
+    header = next(rows, None)
+    if header is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No BOM found for circuit: {circuit_id}",
         )
+
+    return StreamingResponse(
+        itertools.chain((header,), rows),
+        media_type="text/csv; charset=utf-8",
+        headers={
+            "Content-Disposition": f"attachment; filename=bom_{circuit_id}.csv"
+        },
+    )
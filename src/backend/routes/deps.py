@@ -0,0 +1,24 @@
+"""
+Shared Route Dependencies
+
+Per-Database service instances used across the routers, so a write in one
+router can invalidate the caches another router reads from.
+"""
+
+from functools import lru_cache
+
+from ..db import Database
+from ..services.bom_manager import BOMManagerService
+from ..services.component_inventory import ComponentInventoryService
+
+
+@lru_cache(maxsize=4)
+def bom_service_for(db: Database) -> BOMManagerService:
+    """Build one BOM service per Database, sharing its pooled connections."""
+    return BOMManagerService(str(db.db_path), db)
+
+
+@lru_cache(maxsize=4)
+def inventory_service_for(db: Database) -> ComponentInventoryService:
+    """Build one inventory service per Database, sharing its pooled connections."""
+    return ComponentInventoryService(str(db.db_path), db)
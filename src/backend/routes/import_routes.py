@@ -5,20 +5,98 @@ REST endpoints for importing inventory from CSV/Excel files.
 """
 
 import logging
-import tempfile
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status, Query
+import orjson
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
 from pydantic import BaseModel
 
 from ..db import Database, get_db
+from ..responses import cached_response, make_etag
 from ..services.excel_importer import InventoryImporter
+from .deps import bom_service_for, inventory_service_for
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+# Static import documentation, serialized once at import time
+INVENTORY_TEMPLATE_CSV = """Category,SubType,HumanReadableValue,NumericBaseValue,UnitType,Footprint,Voltage,Quantity,ReorderLevel,MfrPartNumber,KeyNotes,RelatedPart,Vendor,VendorSKU
+RESISTOR,Metal Film,10k,10000,ohm,through-hole,,50,10,,,,,
+CAPACITOR,Electrolytic,100uF,0.0001,F,radial,25V,20,5,,,,,
+IC,Op-Amp,TL072,,,DIP8,,10,3,,Dual op-amp low noise,TL071,Mouser,595-TL072CP
+DIODE,Germanium,1N34A,,,through-hole,,25,5,,Authentic NOS germanium diode,,,
+TRANSISTOR,BJT NPN,2N3904,,,TO-92,,100,20,,,2N2222,,,
+"""
+
+FORMAT_INFO = {
+    "format": "CSV",
+    "encoding": "UTF-8",
+    "required_columns": [
+        "Category",
+        "HumanReadableValue",
+        "Quantity",
+    ],
+    "optional_columns": [
+        "SubType",
+        "NumericBaseValue",
+        "UnitType",
+        "Footprint",
+        "Voltage",
+        "ReorderLevel",
+        "MfrPartNumber",
+        "KeyNotes",
+        "RelatedPart",
+        "Vendor",
+        "VendorSKU",
+    ],
+    "category_values": [
+        "RESISTOR",
+        "CAPACITOR",
+        "IC",
+        "TRANSISTOR",
+        "DIODE",
+        "POTENTIOMETER",
+        "SWITCH",
+        "LED",
+        "JACK",
+        "HARDWARE",
+    ],
+    "example_row": {
+        "Category": "RESISTOR",
+        "SubType": "Metal Film",
+        "HumanReadableValue": "10k",
+        "NumericBaseValue": "10000",
+        "UnitType": "ohm",
+        "Footprint": "through-hole",
+        "Voltage": "",
+        "Quantity": "50",
+        "ReorderLevel": "10",
+        "MfrPartNumber": "",
+        "KeyNotes": "",
+        "RelatedPart": "",
+        "Vendor": "",
+        "VendorSKU": "",
+    },
+    "notes": [
+        "CSV must be comma-separated",
+        "First row must contain column headers",
+        "Empty rows will be ignored",
+        "Rows with missing required fields will be skipped",
+        "Component IDs are auto-generated from type, value, and package",
+        "Duplicate components (same ID) will be skipped",
+    ],
+}
+
+_TEMPLATE_BYTES = INVENTORY_TEMPLATE_CSV.encode("utf-8")
+_FORMAT_INFO_BYTES = orjson.dumps(FORMAT_INFO)
+
+# Fixed for the lifetime of the process, so revalidation is a string compare
+_TEMPLATE_ETAG = make_etag(_TEMPLATE_BYTES)
+_FORMAT_INFO_ETAG = make_etag(_FORMAT_INFO_BYTES)
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+
+
 # Response models
 class ImportPreviewResponse(BaseModel):
     """Import preview response."""
@@ -41,7 +119,7 @@ class ImportResultResponse(BaseModel):
 
 
 @router.post("/inventory", response_model=ImportResultResponse)
-async def import_inventory(
+def import_inventory(
     file: UploadFile = File(..., description="CSV file with inventory data"),
     preview: bool = Query(False, description="Preview mode - don't write to database"),
     mode: str = Query("append", description="Import mode: 'append' (skip duplicates) or 'replace' (clear all first)"),
@@ -83,46 +161,40 @@ async def import_inventory(
         )
 
     # Validate file type
-    if not file.filename:
+    filename = file.filename
+    if not filename:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No filename provided",
         )
 
-    if not file.filename.endswith((".csv", ".CSV")):
+    if not filename.lower().endswith(".csv"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only CSV files are supported",
         )
 
-    # Create temporary file
     try:
-        # Read uploaded file
-        contents = await file.read()
-
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(
-            mode="wb", suffix=".csv", delete=False
-        ) as temp_file:
-            temp_file.write(contents)
-            temp_path = temp_file.name
-
-        logger.info(f"Saved uploaded file to temporary location: {temp_path}")
-
-        # Clear existing components if mode is 'replace'
-        if mode == "replace" and not preview:
-            logger.info("Mode=replace: Clearing existing components")
-            with db.transaction() as cursor:
-                cursor.execute("DELETE FROM components")
-                deleted_count = cursor.rowcount
-                logger.info(f"Deleted {deleted_count} existing components")
-
-        # Import using InventoryImporter
-        with InventoryImporter(str(db.db_path)) as importer:
-            result = importer.import_components(temp_path, preview=preview)
-
-        # Clean up temporary file
-        Path(temp_path).unlink()
+        try:
+            # Clear existing components if mode is 'replace'
+            if mode == "replace" and not preview:
+                logger.info("Mode=replace: Clearing existing components")
+                with db.transaction() as cursor:
+                    cursor.execute("DELETE FROM components")
+                    deleted_count = cursor.rowcount
+                    logger.info(f"Deleted {deleted_count} existing components")
+
+            # Import using InventoryImporter
+            with InventoryImporter(str(db.db_path)) as importer:
+                # Parse straight from the upload's spooled file - no temp-file round trip
+                result = importer.import_components(file.file, preview=preview)
+        finally:
+            # Cached inventory aggregates and BOM validations are stale once components
+            # change. A replace commits its DELETE before importing, so this holds even
+            # if the import fails.
+            if not preview:
+                inventory_service_for(db).invalidate_cache()
+                bom_service_for(db).invalidate_validation()
 
         # Format response
         if preview:
@@ -151,102 +223,36 @@ async def import_inventory(
             detail=f"Invalid CSV format: {str(e)}",
         )
 
-    except Exception as e:
-        logger.error(f"Import error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Import failed: {str(e)}",
-        )
-
 
 @router.get("/template")
-async def download_template():
+async def download_template(request: Request):
     """
     Download CSV template for inventory import.
 
     Returns:
         CSV template with example data
     """
-    template_content = """Category,SubType,HumanReadableValue,NumericBaseValue,UnitType,Footprint,Voltage,Quantity,ReorderLevel,MfrPartNumber,KeyNotes,RelatedPart,Vendor,VendorSKU
-RESISTOR,Metal Film,10k,10000,ohm,through-hole,,50,10,,,,,
-CAPACITOR,Electrolytic,100uF,0.0001,F,radial,25V,20,5,,,,,
-IC,Op-Amp,TL072,,,DIP8,,10,3,,Dual op-amp low noise,TL071,Mouser,595-TL072CP
-DIODE,Germanium,1N34A,,,through-hole,,25,5,,Authentic NOS germanium diode,,,
-TRANSISTOR,BJT NPN,2N3904,,,TO-92,,100,20,,,2N2222,,,
-"""
-
-    from fastapi.responses import PlainTextResponse
-
-    return PlainTextResponse(
-        content=template_content,
+    return cached_response(
+        request,
+        _TEMPLATE_BYTES,
+        _TEMPLATE_ETAG,
         media_type="text/csv",
+        cache_control=STATIC_CACHE_CONTROL,
         headers={"Content-Disposition": "attachment; filename=inventory_template.csv"},
     )
 
 
 @router.get("/format")
-async def get_format_info():
+async def get_format_info(request: Request):
     """
     Get information about CSV format requirements.
 
     Returns:
         CSV format documentation
     """
-    return {
-        "format": "CSV",
-        "encoding": "UTF-8",
-        "required_columns": [
-            "Category",
-            "HumanReadableValue",
-            "Quantity",
-        ],
-        "optional_columns": [
-            "SubType",
-            "NumericBaseValue",
-            "UnitType",
-            "Footprint",
-            "Voltage",
-            "ReorderLevel",
-            "MfrPartNumber",
-            "KeyNotes",
-            "RelatedPart",
-            "Vendor",
-            "VendorSKU",
-        ],
-        "category_values": [
-            "RESISTOR",
-            "CAPACITOR",
-            "IC",
-            "TRANSISTOR",
-            "DIODE",
-            "POTENTIOMETER",
-            "SWITCH",
-            "LED",
-            "JACK",
-            "HARDWARE",
-        ],
-        "example_row": {
-            "Category": "RESISTOR",
-            "SubType": "Metal Film",
-            "HumanReadableValue": "10k",
-            "NumericBaseValue": "10000",
-            "UnitType": "ohm",
-            "Footprint": "through-hole",
-            "Voltage": "",
-            "Quantity": "50",
-            "ReorderLevel": "10",
-            "MfrPartNumber": "",
-            "KeyNotes": "",
-            "RelatedPart": "",
-            "Vendor": "",
-            "VendorSKU": "",
-        },
-        "notes": [
-            "CSV must be comma-separated",
-            "First row must contain column headers",
-            "Empty rows will be ignored",
-            "Rows with missing required fields will be skipped",
-            "Component IDs are auto-generated from type, value, and package",
-            "Duplicate components (same ID) will be skipped",
-        ],
-    }
+    return cached_response(
+        request,
+        _FORMAT_INFO_BYTES,
+        _FORMAT_INFO_ETAG,
+        cache_control=STATIC_CACHE_CONTROL,
+    )
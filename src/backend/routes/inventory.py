@@ -7,18 +7,29 @@ REST endpoints for component inventory management.
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
 
 from ..db import Database, get_db, DatabaseError
+from ..responses import ORJSONResponse, etag_json_response
 from ..services.component_inventory import ComponentInventoryService
+from .deps import bom_service_for, inventory_service_for
+from ...models.types import ComponentType
 
 logger = logging.getLogger(__name__)
 
+# Query-string value -> enum member, resolved once instead of per request
+_COMPONENT_TYPES: dict[str, ComponentType] = {ct.value: ct for ct in ComponentType}
+
+# Handlers are plain `def`: they call blocking sqlite services, so FastAPI runs
+# them in its worker threadpool instead of on the event loop
 router = APIRouter()
 
 
 # Request/Response models
+# Component read endpoints return DB rows serialized with orjson (ETag-tagged
+# where clients can revalidate); the response models below document those
+# payloads in OpenAPI without per-row validation.
 class ComponentResponse(BaseModel):
     """Component response model."""
 
@@ -40,6 +51,10 @@ class ComponentResponse(BaseModel):
     updated_at: str
 
 
+# Response field order, resolved once instead of per request
+_COMPONENT_RESPONSE_FIELDS = tuple(ComponentResponse.model_fields)
+
+
 class ComponentListResponse(BaseModel):
     """List of components response."""
 
@@ -57,6 +72,15 @@ class InventoryStatsResponse(BaseModel):
     by_type: dict[str, dict]
 
 
+class InventoryBootstrapResponse(BaseModel):
+    """Inventory page-load response: listing, statistics and low stock."""
+
+    components: list[dict]
+    total: int
+    stats: InventoryStatsResponse
+    low_stock: list[dict]
+
+
 class UpdateQuantityRequest(BaseModel):
     """Request to update component quantity."""
 
@@ -73,11 +97,12 @@ class UpdateQuantityResponse(BaseModel):
 
 def get_inventory_service(db: Database = Depends(get_db)) -> ComponentInventoryService:
     """Get inventory service instance."""
-    return ComponentInventoryService(str(db.db_path))
+    return inventory_service_for(db)
 
 
-@router.get("/", response_model=ComponentListResponse)
-async def list_components(
+@router.get("/", responses={200: {"model": ComponentListResponse}})
+def list_components(
+    request: Request,
     type: Optional[str] = Query(None, description="Filter by component type"),
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
@@ -91,36 +116,22 @@ async def list_components(
     Returns:
         List of components
     """
-    try:
-        from ...models.types import ComponentType
-
-        comp_type = None
-        if type:
-            try:
-                comp_type = ComponentType(type)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid component type: {type}",
-                )
-
-        components = service.list_components(comp_type)
-
-        return ComponentListResponse(
-            components=components,
-            total=len(components),
-        )
+    comp_type = None
+    if type:
+        comp_type = _COMPONENT_TYPES.get(type)
+        if comp_type is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid component type: {type}",
+            )
 
-    except Exception as e:
-        logger.error(f"Error listing components: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    components = service.list_components(comp_type)
+
+    return etag_json_response(request, {"components": components, "total": len(components)})
 
 
-@router.get("/search", response_model=ComponentListResponse)
-async def search_components(
+@router.get("/search", responses={200: {"model": ComponentListResponse}})
+def search_components(
     q: str = Query(..., min_length=1, description="Search query"),
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
@@ -134,24 +145,13 @@ async def search_components(
     Returns:
         Matching components
     """
-    try:
-        components = service.search_components(q)
-
-        return ComponentListResponse(
-            components=components,
-            total=len(components),
-        )
+    components = service.search_components(q)
 
-    except Exception as e:
-        logger.error(f"Error searching components: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    return ORJSONResponse({"components": components, "total": len(components)})
 
 
-@router.get("/low-stock", response_model=ComponentListResponse)
-async def get_low_stock(
+@router.get("/low-stock", responses={200: {"model": ComponentListResponse}})
+def get_low_stock(
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
     """
@@ -160,24 +160,30 @@ async def get_low_stock(
     Returns:
         Components where quantity_in_stock <= minimum_quantity
     """
-    try:
-        components = service.get_low_stock()
+    components = service.get_low_stock()
 
-        return ComponentListResponse(
-            components=components,
-            total=len(components),
-        )
+    return ORJSONResponse({"components": components, "total": len(components)})
 
-    except Exception as e:
-        logger.error(f"Error getting low stock: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
 
+@router.get("/bootstrap", responses={200: {"model": InventoryBootstrapResponse}})
+def get_bootstrap(
+    request: Request,
+    service: ComponentInventoryService = Depends(get_inventory_service),
+):
+    """
+    Get everything the inventory page needs on load in one request.
 
-@router.get("/stats", response_model=InventoryStatsResponse)
-async def get_statistics(
+    Returns:
+        All components, inventory statistics and low-stock components
+    """
+    data = service.get_bootstrap()
+    data["total"] = len(data["components"])
+    return etag_json_response(request, data)
+
+
+@router.get("/stats", responses={200: {"model": InventoryStatsResponse}})
+def get_statistics(
+    request: Request,
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
     """
@@ -186,20 +192,13 @@ async def get_statistics(
     Returns:
         Statistics grouped by component type
     """
-    try:
-        stats = service.get_statistics()
-        return InventoryStatsResponse(**stats)
-
-    except Exception as e:
-        logger.error(f"Error getting statistics: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
-        )
+    stats = service.get_statistics()
+    return etag_json_response(request, stats)
 
 
-@router.get("/{component_id}", response_model=ComponentResponse)
-async def get_component(
+@router.get("/{component_id}", responses={200: {"model": ComponentResponse}})
+def get_component(
+    request: Request,
     component_id: str,
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
@@ -213,31 +212,25 @@ async def get_component(
     Returns:
         Component details
     """
-    try:
-        component = service.get_component(component_id)
-
-        if not component:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Component not found: {component_id}",
-            )
-
-        return ComponentResponse(**component)
+    component = service.get_component(component_id)
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting component: {e}")
+    if not component:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Component not found: {component_id}",
         )
 
+    # Trusted DB row: project the response fields directly, no model instance
+    return etag_json_response(
+        request, {field: component[field] for field in _COMPONENT_RESPONSE_FIELDS}
+    )
+
 
 @router.patch("/{component_id}/quantity", response_model=UpdateQuantityResponse)
-async def update_quantity(
+def update_quantity(
     component_id: str,
     request: UpdateQuantityRequest,
+    db: Database = Depends(get_db),
     service: ComponentInventoryService = Depends(get_inventory_service),
 ):
     """
@@ -246,43 +239,26 @@ async def update_quantity(
     Args:
         component_id: Component ID
         request: Quantity update request (delta can be positive or negative)
+        db: Database dependency
         service: Inventory service dependency
 
     Returns:
         Update result with new quantity
     """
-    try:
-        # First check if component exists
-        component = service.get_component(component_id)
-        if not component:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Component not found: {component_id}",
-            )
-
-        # Update quantity
-        success = service.update_quantity(component_id, request.delta)
-
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update quantity",
-            )
+    # Update and read back the new quantity in a single statement
+    new_quantity = service.apply_quantity_delta(component_id, request.delta)
 
-        # Get updated component
-        updated_component = service.get_component(component_id)
-
-        return UpdateQuantityResponse(
-            success=True,
-            component_id=component_id,
-            new_quantity=updated_component["quantity_in_stock"],
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error updating quantity: {e}")
+    if new_quantity is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e),
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Component not found: {component_id}",
         )
+
+    # BOM validations compare against stock levels
+    bom_service_for(db).invalidate_validation()
+
+    return UpdateQuantityResponse.model_construct(
+        success=True,
+        component_id=component_id,
+        new_quantity=new_quantity,
+    )
@@ -3,53 +3,150 @@ BOM Manager Service
 Business logic for Bill of Materials management in Python
 """
 
+import csv
+import io
 import sqlite3
-from typing import List, Dict, Optional
+from contextlib import closing
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Dict, Optional
 from pathlib import Path
-import sys
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
-from models.types import ComponentType, CircuitBOMItem
+from ..db import Database
+from .result_cache import ResultCache
+from .schema_upgrades import ensure_indexes
 
+CSV_HEADER = ("Type", "Value", "Quantity", "Reference Designators", "Critical", "Confidence")
 
-class BOMManagerService:
-    """BOM management service"""
+# BOM export columns, in CSV field order
+BOM_CSV_SQL = """
+    SELECT component_type, component_value, quantity, reference_designator,
+           is_critical, confidence_score
+    FROM circuit_bom
+    WHERE circuit_id = ?
+    ORDER BY component_type, component_value
+"""
 
-    def __init__(self, db_path: str):
-        self.db_path = db_path
+# BOM lines written per chunk of a streamed CSV export
+CSV_CHUNK_ROWS = 256
 
-    def _get_conn(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+BOM_COLUMNS = (
+    "id", "circuit_id", "component_type", "component_value", "quantity",
+    "reference_designator", "substitution_allowed", "substitution_notes",
+    "is_critical", "position_x", "position_y", "confidence_score",
+)
 
-    def get_bom(self, circuit_id: str) -> List[Dict]:
-        """Get BOM for a circuit"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
+INSERT_BOM_ITEM_SQL = f"""
+    INSERT INTO circuit_bom ({", ".join(BOM_COLUMNS)})
+    VALUES ({", ".join("?" * len(BOM_COLUMNS))})
+"""
 
-        cursor.execute(
-            "SELECT * FROM circuit_bom WHERE circuit_id = ? ORDER BY component_type, component_value",
-            (circuit_id,)
-        )
+# Per-type counts, then one totals row with a NULL component_type
+BOM_STATS_SQL = """
+    WITH grouped AS (
+        SELECT
+            component_type,
+            COUNT(*) as count,
+            SUM(CASE WHEN is_critical = 1 THEN 1 ELSE 0 END) as critical_count,
+            SUM(CASE WHEN confidence_score < 0.7 THEN 1 ELSE 0 END) as low_confidence_count
+        FROM circuit_bom
+        WHERE circuit_id = ?
+        GROUP BY component_type
+    )
+    SELECT * FROM grouped
+    UNION ALL
+    SELECT NULL, COALESCE(SUM(count), 0), COALESCE(SUM(critical_count), 0),
+           COALESCE(SUM(low_confidence_count), 0)
+    FROM grouped
+"""
 
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+COMPONENT_COLUMNS = (
+    "id", "type", "name", "sub_type", "value", "tolerance", "package", "manufacturer",
+    "part_number", "datasheet_url", "quantity_in_stock", "minimum_quantity",
+    "unit_price", "location", "voltage", "alternatives_json", "notes",
+    "created_at", "updated_at",
+)
+
+# Ordered to match idx_bom_circuit, so SQLite walks the index instead of sorting
+BOM_BY_CIRCUIT_SQL = f"""
+    SELECT {", ".join(BOM_COLUMNS)}
+    FROM circuit_bom
+    WHERE circuit_id = ?
+    ORDER BY component_type, component_value
+"""
 
-        conn.close()
-        return results
+# Each BOM row joined to its best stocked component (same type and value, most
+# units in stock); BOM rows without a match carry NULL component columns
+VALIDATE_BOM_SQL = f"""
+    SELECT {", ".join("b." + col for col in BOM_COLUMNS)},
+           {", ".join("c." + col for col in COMPONENT_COLUMNS)}
+    FROM circuit_bom b
+    LEFT JOIN components c ON c.id = (
+        SELECT id FROM components
+        WHERE type = b.component_type AND value = b.component_value
+        ORDER BY quantity_in_stock DESC, id
+        LIMIT 1
+    )
+    WHERE b.circuit_id = ?
+    ORDER BY b.component_type, b.component_value, b.id
+"""
+
+# BOM rows no single stocked component can cover, in validate_bom()'s order
+SHOPPING_LIST_SQL = """
+    SELECT b.component_type, b.component_value, b.quantity, b.reference_designator
+    FROM circuit_bom b
+    WHERE b.circuit_id = ?
+      AND NOT EXISTS (
+          SELECT 1 FROM components c
+          WHERE c.type = b.component_type
+            AND c.value = b.component_value
+            AND c.quantity_in_stock >= b.quantity
+      )
+    ORDER BY b.component_type, b.component_value, b.id
+"""
 
-    def get_bom_by_type(self, circuit_id: str) -> Dict[str, List[Dict]]:
-        """Get BOM organized by component type"""
-        bom_items = self.get_bom(circuit_id)
 
-        by_type = {}
-        for item in bom_items:
-            comp_type = item['component_type']
-            if comp_type not in by_type:
-                by_type[comp_type] = []
-            by_type[comp_type].append(item)
+def _csv_records(rows: Iterable[tuple]) -> Iterator[tuple]:
+    """Format BOM_CSV_SQL rows as CSV field tuples"""
+    return (
+        (comp_type, value, quantity, refs or '', 'Yes' if critical else 'No', f"{confidence:.2f}")
+        for comp_type, value, quantity, refs, critical, confidence in rows
+    )
 
-        return by_type
+
+class BOMManagerService:
+    """BOM management service"""
+
+    def __init__(self, db_path: str, db: Optional[Database] = None):
+        self.db_path = db_path
+        # Persistent pooled connections; share the app's Database when given one
+        self._db = db or Database(Path(db_path))
+        # Per-circuit statistics cached until the circuit's BOM changes or TTL expiry
+        self._cache = ResultCache(ttl=60.0)
+        # Per-circuit validation results; these also go stale when inventory changes
+        self._validation_cache = ResultCache(ttl=60.0)
+        ensure_indexes(self._get_conn())
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the calling thread's persistent (autocommit) database connection"""
+        return self._db.get_connection()
+
+    def invalidate_validation(self):
+        """Drop cached BOM validations after inventory changes made outside this service"""
+        self._validation_cache.invalidate()
+
+    def get_bom(self, circuit_id: str) -> List[sqlite3.Row]:
+        """Get BOM for a circuit (rows support item['column'] access)"""
+        return self._get_conn().execute(BOM_BY_CIRCUIT_SQL, (circuit_id,)).fetchall()
+
+    def get_bom_by_type(self, circuit_id: str) -> Dict[str, List[sqlite3.Row]]:
+        """Get BOM organized by component type"""
+        # get_bom() is sorted by component_type, so each type is one contiguous run
+        bom_items = self.get_bom(circuit_id)
+        return {
+            comp_type: list(items)
+            for comp_type, items in groupby(bom_items, key=itemgetter('component_type'))
+        }
 
     def add_bom_item(self, circuit_id: str, item: Dict) -> bool:
         """Add item to BOM"""
@@ -59,13 +156,7 @@ class BOMManagerService:
         # Generate ID
         item_id = f"{circuit_id}_{item['component_type']}_{item['component_value']}_{item['quantity']}"
 
-        cursor.execute("""
-            INSERT INTO circuit_bom (
-                id, circuit_id, component_type, component_value, quantity,
-                reference_designator, substitution_allowed, substitution_notes,
-                is_critical, position_x, position_y, confidence_score
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(INSERT_BOM_ITEM_SQL, (
             item_id,
             circuit_id,
             item['component_type'],
@@ -80,51 +171,50 @@ class BOMManagerService:
             item.get('confidence_score', 1.0)
         ))
 
-        conn.commit()
         success = cursor.rowcount > 0
-        conn.close()
 
+        self._cache.invalidate(("statistics", circuit_id))
+        self._validation_cache.invalidate(circuit_id)
         return success
 
     def validate_bom(self, circuit_id: str) -> Dict:
         """Validate BOM against inventory"""
-        bom_items = self.get_bom(circuit_id)
-
-        # Import component inventory service
-        from .component_inventory import ComponentInventoryService
+        return self._validation_cache.get_or_compute(
+            circuit_id, lambda: self._query_validation(circuit_id)
+        )
 
-        inventory_service = ComponentInventoryService(self.db_path)
+    def _query_validation(self, circuit_id: str) -> Dict:
+        """Match each BOM item against inventory"""
+        conn = self._get_conn()
+        cursor = conn.execute(VALIDATE_BOM_SQL, (circuit_id,))
 
+        n_bom = len(BOM_COLUMNS)
+        bom_items = []
         matches = []
         missing = []
         available_count = 0
 
-        for bom_item in bom_items:
-            # Search for matching component
-            search_results = inventory_service.search_components(bom_item['component_value'])
+        for row in cursor:
+            bom_item = dict(zip(BOM_COLUMNS, row[:n_bom]))
+            component = dict(zip(COMPONENT_COLUMNS, row[n_bom:])) if row[n_bom] is not None else None
+            bom_items.append(bom_item)
 
-            # Filter by type
-            matching = [
-                c for c in search_results
-                if c['type'] == bom_item['component_type']
-            ]
-
-            if matching and matching[0]['quantity_in_stock'] >= bom_item['quantity']:
+            if component and component['quantity_in_stock'] >= bom_item['quantity']:
                 matches.append({
                     'bom_item': bom_item,
-                    'component': matching[0],
+                    'component': component,
                     'available': True,
                     'quantity_needed': bom_item['quantity'],
-                    'quantity_available': matching[0]['quantity_in_stock']
+                    'quantity_available': component['quantity_in_stock']
                 })
                 available_count += 1
             else:
                 missing.append({
                     'bom_item': bom_item,
-                    'component': matching[0] if matching else None,
+                    'component': component,
                     'available': False,
                     'quantity_needed': bom_item['quantity'],
-                    'quantity_available': matching[0]['quantity_in_stock'] if matching else 0
+                    'quantity_available': component['quantity_in_stock'] if component else 0
                 })
 
         completeness = available_count / len(bom_items) if bom_items else 0
@@ -140,16 +230,17 @@ class BOMManagerService:
 
     def get_shopping_list(self, circuit_id: str) -> Dict:
         """Get shopping list of missing components"""
-        validation = self.validate_bom(circuit_id)
-
-        shopping_list = []
-        for item in validation['missing']:
-            shopping_list.append({
-                'type': item['bom_item']['component_type'],
-                'value': item['bom_item']['component_value'],
-                'quantity': item['bom_item']['quantity'],
-                'references': item['bom_item']['reference_designator'].split(',') if item['bom_item']['reference_designator'] else []
-            })
+        cursor = self._get_conn().execute(SHOPPING_LIST_SQL, (circuit_id,))
+
+        shopping_list = [
+            {
+                'type': comp_type,
+                'value': value,
+                'quantity': quantity,
+                'references': refs.split(',') if refs else []
+            }
+            for comp_type, value, quantity, refs in cursor
+        ]
 
         return {
             'missing_items': shopping_list,
@@ -158,51 +249,67 @@ class BOMManagerService:
 
     def export_bom_csv(self, circuit_id: str) -> str:
         """Export BOM to CSV format"""
-        bom_items = self.get_bom(circuit_id)
-
-        lines = ["Type,Value,Quantity,Reference Designators,Critical,Confidence"]
-
-        for item in bom_items:
-            lines.append(
-                f"{item['component_type']},"
-                f"{item['component_value']},"
-                f"{item['quantity']},"
-                f"\"{item['reference_designator'] or ''}\","
-                f"{'Yes' if item['is_critical'] else 'No'},"
-                f"{item['confidence_score']:.2f}"
-            )
-
-        return "\n".join(lines)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+
+        cursor = self._get_conn().execute(BOM_CSV_SQL, (circuit_id,))
+        writer.writerows(_csv_records(cursor))
+
+        return buffer.getvalue()
+
+    def iter_bom_csv_rows(self, circuit_id: str) -> Iterator[bytes]:
+        """Stream the BOM CSV as encoded chunks of up to CSV_CHUNK_ROWS lines
+
+        Yields nothing at all when the circuit has no BOM items, so callers can
+        detect an empty BOM from the first chunk. Otherwise the chunks joined
+        together equal export_bom_csv(). Rows are read lazily from the cursor of a
+        borrowed pooled connection, which the threadpool threads driving a
+        streaming response can share.
+        """
+        with (
+            self._db.borrow_connection() as conn,
+            # Finish the read before the connection goes back to the pool
+            closing(conn.execute(BOM_CSV_SQL, (circuit_id,))) as cursor,
+        ):
+            records = _csv_records(cursor)
+
+            first = next(records, None)
+            if first is None:
+                return
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(CSV_HEADER)
+            writer.writerow(first)
+
+            while True:
+                writer.writerows(islice(records, CSV_CHUNK_ROWS))
+                chunk = buffer.getvalue()
+                if not chunk:
+                    break
+
+                yield chunk.encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
 
     def get_statistics(self, circuit_id: str) -> Dict:
         """Get BOM statistics"""
+        return self._cache.get_or_compute(
+            ("statistics", circuit_id), lambda: self._query_statistics(circuit_id)
+        )
+
+    def _query_statistics(self, circuit_id: str) -> Dict:
+        """Query BOM statistics"""
         conn = self._get_conn()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT
-                component_type,
-                COUNT(*) as count,
-                SUM(CASE WHEN is_critical = 1 THEN 1 ELSE 0 END) as critical_count,
-                SUM(CASE WHEN confidence_score < 0.7 THEN 1 ELSE 0 END) as low_confidence_count
-            FROM circuit_bom
-            WHERE circuit_id = ?
-            GROUP BY component_type
-        """, (circuit_id,))
-
-        by_type = {}
-        total_items = 0
-        critical_count = 0
-        low_confidence_count = 0
-
-        for row in cursor.fetchall():
-            comp_type = row[0]
-            by_type[comp_type] = row[1]
-            total_items += row[1]
-            critical_count += row[2]
-            low_confidence_count += row[3]
-
-        conn.close()
+        cursor.execute(BOM_STATS_SQL, (circuit_id,))
+
+        # UNION ALL emits the totals row after the per-type rows
+        *grouped, totals = cursor.fetchall()
+        _, total_items, critical_count, low_confidence_count = totals
+        by_type = {comp_type: count for comp_type, count, _, _ in grouped}
 
         return {
             'total_items': total_items,
@@ -217,7 +324,7 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 3:
-        print("Usage: python service.py <command> <circuit_id>")
+        print("Usage: python -m src.backend.services.bom_manager <command> <circuit_id>")
         print("Commands: show, validate, shopping-list, stats, export")
         sys.exit(1)
 
@@ -6,152 +6,171 @@ Business logic for component management in Python
 import sqlite3
 from typing import List, Optional, Dict
 from pathlib import Path
-import sys
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
-from models.types import Component, ComponentType
+from ...models.types import ComponentType
+from ..db import Database
+from .result_cache import ResultCache
+from .schema_upgrades import ensure_indexes
+
+COMPONENTS_SQL = "SELECT * FROM components ORDER BY type, value"
+
+COMPONENTS_BY_TYPE_SQL = "SELECT * FROM components WHERE type = ? ORDER BY type, value"
+
+COMPONENT_BY_ID_SQL = "SELECT * FROM components WHERE id = ?"
+
+LOW_STOCK_SQL = """
+    SELECT * FROM components
+    WHERE quantity_in_stock <= minimum_quantity
+    ORDER BY type, value
+"""
+
+APPLY_QUANTITY_DELTA_SQL = """
+    UPDATE components
+    SET quantity_in_stock = quantity_in_stock + ?,
+        updated_at = datetime('now')
+    WHERE id = ?
+    RETURNING quantity_in_stock
+"""
+
+# Per-type counts, then one totals row with a NULL type
+INVENTORY_STATS_SQL = """
+    WITH grouped AS (
+        SELECT
+            type,
+            COUNT(*) as type_count,
+            SUM(quantity_in_stock) as total_units,
+            SUM(CASE WHEN quantity_in_stock <= minimum_quantity THEN 1 ELSE 0 END) as low_stock_count,
+            SUM(CASE WHEN quantity_in_stock = 0 THEN 1 ELSE 0 END) as out_of_stock_count
+        FROM components
+        GROUP BY type
+    )
+    SELECT * FROM grouped
+    UNION ALL
+    SELECT NULL, COALESCE(SUM(type_count), 0), COALESCE(SUM(total_units), 0),
+           COALESCE(SUM(low_stock_count), 0), COALESCE(SUM(out_of_stock_count), 0)
+    FROM grouped
+"""
+
+# Substring search, exact and leading value matches first
+SEARCH_SQL = """
+    SELECT * FROM components
+    WHERE value LIKE ? OR name LIKE ? OR part_number LIKE ?
+    ORDER BY
+        CASE
+            WHEN value = ? THEN 1
+            WHEN value LIKE ? THEN 2
+            WHEN name LIKE ? THEN 3
+            ELSE 4
+        END,
+        type, value
+"""
 
 
 class ComponentInventoryService:
     """Component inventory management service"""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, db: Optional[Database] = None):
         self.db_path = db_path
+        # Persistent pooled connections; share the app's Database when given one
+        self._db = db or Database(Path(db_path))
+        # Aggregate reads (stats, low stock) cached until a write or TTL expiry
+        self._cache = ResultCache(ttl=60.0)
+        ensure_indexes(self._get_conn())
+
+    def invalidate_cache(self):
+        """Drop cached aggregates after inventory changes made outside this service"""
+        self._cache.invalidate()
 
-    def _get_conn(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the calling thread's persistent (autocommit) database connection"""
+        return self._db.get_connection()
 
-    def list_components(self, comp_type: Optional[ComponentType] = None) -> List[Dict]:
+    def list_components(self, comp_type: Optional[ComponentType] = None) -> List[sqlite3.Row]:
         """List all components with optional type filter"""
         conn = self._get_conn()
-        cursor = conn.cursor()
+        results = self._select_components(conn.cursor(), comp_type)
+        return results
 
+    def _select_components(
+        self, cursor: sqlite3.Cursor, comp_type: Optional[ComponentType] = None
+    ) -> List[sqlite3.Row]:
+        """Run the component listing query on an open cursor"""
         if comp_type:
-            cursor.execute(
-                "SELECT * FROM components WHERE type = ? ORDER BY type, value",
-                (comp_type.value,)
-            )
+            cursor.execute(COMPONENTS_BY_TYPE_SQL, (comp_type.value,))
         else:
-            cursor.execute("SELECT * FROM components ORDER BY type, value")
+            cursor.execute(COMPONENTS_SQL)
 
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return cursor.fetchall()
 
-        conn.close()
-        return results
-
-    def search_components(self, query: str) -> List[Dict]:
-        """Search components by value or name"""
+    def search_components(self, query: str) -> List[sqlite3.Row]:
+        """Search components by value, name or part number substring"""
         conn = self._get_conn()
         cursor = conn.cursor()
 
         pattern = f"%{query}%"
-        cursor.execute("""
-            SELECT * FROM components
-            WHERE value LIKE ? OR name LIKE ? OR part_number LIKE ?
-            ORDER BY
-                CASE
-                    WHEN value = ? THEN 1
-                    WHEN value LIKE ? THEN 2
-                    WHEN name LIKE ? THEN 3
-                    ELSE 4
-                END,
-                type, value
-        """, (pattern, pattern, pattern, query, f"{query}%", f"{query}%"))
-
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-        conn.close()
-        return results
+        cursor.execute(SEARCH_SQL, (pattern, pattern, pattern, query, f"{query}%", f"{query}%"))
 
-    def get_component(self, component_id: str) -> Optional[Dict]:
+        return cursor.fetchall()
+
+    def get_component(self, component_id: str) -> Optional[sqlite3.Row]:
         """Get component by ID"""
         conn = self._get_conn()
-        cursor = conn.cursor()
+        return conn.execute(COMPONENT_BY_ID_SQL, (component_id,)).fetchone()
 
-        cursor.execute("SELECT * FROM components WHERE id = ?", (component_id,))
-        row = cursor.fetchone()
-
-        if row:
-            columns = [desc[0] for desc in cursor.description]
-            result = dict(zip(columns, row))
-        else:
-            result = None
-
-        conn.close()
-        return result
-
-    def get_low_stock(self) -> List[Dict]:
+    def get_low_stock(self) -> List[sqlite3.Row]:
         """Get components with low stock"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        return self._cache.get_or_compute("low_stock", self._query_low_stock)
 
-        cursor.execute("""
-            SELECT * FROM components
-            WHERE quantity_in_stock <= minimum_quantity
-            ORDER BY type, value
-        """)
+    def _query_low_stock(self) -> List[sqlite3.Row]:
+        """Query components with low stock"""
+        conn = self._get_conn()
+        results = self._select_low_stock(conn.cursor())
+        return results
 
-        columns = [desc[0] for desc in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    def _select_low_stock(self, cursor: sqlite3.Cursor) -> List[sqlite3.Row]:
+        """Run the low-stock query on an open cursor"""
+        cursor.execute(LOW_STOCK_SQL)
 
-        conn.close()
-        return results
+        return cursor.fetchall()
 
     def update_quantity(self, component_id: str, delta: int) -> bool:
         """Update component quantity (add or subtract)"""
+        return self.apply_quantity_delta(component_id, delta) is not None
+
+    def apply_quantity_delta(self, component_id: str, delta: int) -> Optional[int]:
+        """Apply a quantity delta and return the new quantity (None if component missing)"""
         conn = self._get_conn()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            UPDATE components
-            SET quantity_in_stock = quantity_in_stock + ?,
-                updated_at = datetime('now')
-            WHERE id = ?
-        """, (delta, component_id))
+        cursor.execute(APPLY_QUANTITY_DELTA_SQL, (delta, component_id))
 
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        # Drain the RETURNING rows so the autocommit statement completes
+        rows = cursor.fetchall()
 
-        return success
+        self._cache.invalidate()
+        return rows[0][0] if rows else None
 
     def get_statistics(self) -> Dict:
         """Get inventory statistics"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT
-                type,
-                COUNT(*) as type_count,
-                SUM(quantity_in_stock) as total_units,
-                SUM(CASE WHEN quantity_in_stock <= minimum_quantity THEN 1 ELSE 0 END) as low_stock_count,
-                SUM(CASE WHEN quantity_in_stock = 0 THEN 1 ELSE 0 END) as out_of_stock_count
-            FROM components
-            GROUP BY type
-        """)
-
-        by_type = {}
-        total_types = 0
-        total_units = 0
-        low_stock_count = 0
-        out_of_stock_count = 0
-
-        for row in cursor.fetchall():
-            comp_type = row[0]
-            by_type[comp_type] = {
-                'types': row[1],
-                'units': row[2]
-            }
-            total_types += row[1]
-            total_units += row[2]
-            low_stock_count += row[3]
-            out_of_stock_count += row[4]
+        return self._cache.get_or_compute("statistics", self._query_statistics)
 
-        conn.close()
+    def _query_statistics(self) -> Dict:
+        """Query inventory statistics"""
+        conn = self._get_conn()
+        stats = self._select_statistics(conn.cursor())
+        return stats
+
+    def _select_statistics(self, cursor: sqlite3.Cursor) -> Dict:
+        """Run the statistics query on an open cursor"""
+        cursor.execute(INVENTORY_STATS_SQL)
+
+        # UNION ALL emits the totals row after the per-type rows
+        *grouped, totals = cursor.fetchall()
+        _, total_types, total_units, low_stock_count, out_of_stock_count = totals
+        by_type = {
+            comp_type: {'types': type_count, 'units': units}
+            for comp_type, type_count, units, _, _ in grouped
+        }
 
         return {
             'total_types': total_types,
@@ -161,13 +180,26 @@ class ComponentInventoryService:
             'out_of_stock_count': out_of_stock_count
         }
 
+    def get_bootstrap(self) -> Dict:
+        """Get components, statistics and low stock from one read transaction
+
+        All three come from the same database snapshot, so the page-load view is
+        consistent even if a write lands between the queries.
+        """
+        with self._db.transaction() as cursor:
+            return {
+                'components': self._select_components(cursor),
+                'stats': self._select_statistics(cursor),
+                'low_stock': self._select_low_stock(cursor),
+            }
+
 
 # CLI for testing
 if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python service.py <command> [args]")
+        print("Usage: python -m src.backend.services.component_inventory <command> [args]")
         print("Commands: list, search <query>, stats, low-stock")
         sys.exit(1)
 
@@ -5,26 +5,89 @@ Import component inventory from user's custom CSV format into SQLite database
 """
 
 import pandas as pd
+import re
 import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import IO, Iterator, List, Dict, Union
 import sys
 
-# Add src to path for types
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
-from models.types import ComponentType
+# Free-text CSV columns, read as strings instead of type-inferred. Numeric-looking
+# part numbers and values stay as written (no "1234.0" from a float column), and
+# don't depend on which other rows share their chunk.
+CSV_TEXT_DTYPES = {
+    column: str
+    for column in (
+        'Category', 'SubType', 'HumanReadableValue', 'NumericBaseValue', 'Footprint',
+        'Voltage', 'MfrPartNumber', 'KeyNotes', 'RelatedPart', 'Vendor', 'VendorSKU',
+    )
+}
+# Required CSV columns; rows missing any of them are dropped
+REQUIRED_COLUMNS = ['Category', 'HumanReadableValue', 'Quantity']
+
+# Rows parsed, transformed and inserted per step of a streamed import
+CSV_CHUNK_ROWS = 10_000
+
+INSERT_COMPONENT_SQL = """
+    INSERT INTO components (
+        id, type, name, sub_type, value, tolerance, package, manufacturer,
+        part_number, datasheet_url, quantity_in_stock, minimum_quantity,
+        unit_price, location, voltage, alternatives_json, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO NOTHING
+"""
+
+
+# Characters replaced by '_' in component IDs, one for one so existing IDs stay stable
+_ID_SEPARATOR_RE = re.compile(r'[ /\-.]')
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column as str values, with missing cells (or a missing column) as None"""
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    col = df[column]
+    return col.astype(str).where(col.notna(), None)
+
+
+def _clean_id_part(s: pd.Series) -> pd.Series:
+    """Lowercase and replace ID separator characters, like generate_component_id()"""
+    return s.str.lower().str.replace(_ID_SEPARATOR_RE, '_', regex=True)
 
 
 class InventoryImporter:
     """Import inventory from CSV to database"""
 
+    # Stripped, upper-cased CSV Category -> database component type
+    TYPE_MAP = {
+        'RESISTOR': 'resistor',
+        'RESISTORS': 'resistor',
+        'CAPACITOR': 'capacitor',
+        'CAPACITORS': 'capacitor',
+        'IC': 'ic',
+        'ICS': 'ic',
+        'TRANSISTOR': 'transistor',
+        'TRANSISTORS': 'transistor',
+        'DIODE': 'diode',
+        'DIODES': 'diode',
+        'POT': 'potentiometer',
+        'POTS': 'potentiometer',
+        'POTENTIOMETER': 'potentiometer',
+        'POTENTIOMETERS': 'potentiometer',
+        'HARDWARE': 'hardware',
+        'SWITCH': 'switch',
+        'LED': 'led',
+        'JACK': 'jack',
+    }
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = None
 
     def __enter__(self):
         self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -33,36 +96,12 @@ class InventoryImporter:
 
     def normalize_type(self, category: str) -> str:
         """Normalize component type from CSV to database enum"""
-        type_map = {
-            'RESISTOR': 'resistor',
-            'RESISTORS': 'resistor',
-            'CAPACITOR': 'capacitor',
-            'CAPACITORS': 'capacitor',
-            'IC': 'ic',
-            'ICS': 'ic',
-            'IC ': 'ic',  # Handle trailing space
-            'TRANSISTOR': 'transistor',
-            'TRANSISTORS': 'transistor',
-            'DIODE': 'diode',
-            'DIODES': 'diode',
-            'POT': 'potentiometer',
-            'POTS': 'potentiometer',
-            'POTENTIOMETER': 'potentiometer',
-            'POTENTIOMETERS': 'potentiometer',
-            'HARDWARE': 'hardware',
-            'HARDWARE ': 'hardware',  # Handle trailing space
-            'SWITCH': 'switch',
-            'LED': 'led',
-            'JACK': 'jack',
-        }
-
-        normalized = category.strip().upper()
-        return type_map.get(normalized, 'other')
+        return self.TYPE_MAP.get(category.strip().upper(), 'other')
 
     def generate_component_id(self, comp_type: str, sub_type: str, value: str, package: str) -> str:
         """Generate unique component ID based on type, sub_type, value, and package"""
         def clean(s: str) -> str:
-            return s.lower().replace(' ', '_').replace('/', '_').replace('-', '_').replace('.', '_')
+            return _ID_SEPARATOR_RE.sub('_', s.lower())
 
         parts = [clean(comp_type)]
         if sub_type:
@@ -85,160 +124,170 @@ class InventoryImporter:
         else:
             return "Unknown Component"
 
-    def parse_csv(self, csv_path: str) -> pd.DataFrame:
-        """Parse CSV file"""
+    def parse_csv(self, csv_path: Union[str, IO]) -> pd.DataFrame:
+        """Parse CSV from a file path or an open (text or binary) file object"""
         # Read CSV
-        df = pd.read_csv(csv_path)
+        df = pd.read_csv(csv_path, dtype=CSV_TEXT_DTYPES)
+        return self._clean_rows(df)
 
+    def iter_csv_chunks(self, csv_path: Union[str, IO]) -> Iterator[pd.DataFrame]:
+        """Parse CSV like parse_csv(), in frames of up to CSV_CHUNK_ROWS rows"""
+        with pd.read_csv(csv_path, dtype=CSV_TEXT_DTYPES, chunksize=CSV_CHUNK_ROWS) as reader:
+            for chunk in reader:
+                yield self._clean_rows(chunk)
+
+    def _clean_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Check required columns and drop empty or incomplete rows"""
         # Remove completely empty rows
         df = df.dropna(how='all')
 
         # Required columns
-        required = ['Category', 'HumanReadableValue', 'Quantity']
-        for col in required:
+        for col in REQUIRED_COLUMNS:
             if col not in df.columns:
                 raise ValueError(f"Missing required column: {col}")
 
         # Remove rows with missing required fields
-        df = df.dropna(subset=required)
-
-        return df
+        return df.dropna(subset=REQUIRED_COLUMNS)
 
     def transform_row(self, row: pd.Series) -> Dict:
         """Transform CSV row to component data"""
+        return self.transform(row.to_frame().T)[0]
+
+    def transform(self, df: pd.DataFrame) -> List[Dict]:
+        """Transform parsed CSV rows to component data, column by column"""
         # Normalize type
-        comp_type = self.normalize_type(row['Category'])
+        categories = df['Category'].astype(str).str.strip().str.upper()
+        comp_type = categories.map(self.TYPE_MAP).fillna('other')
 
         # Create name
-        subtype = str(row.get('SubType', '')) if pd.notna(row.get('SubType')) else ''
-        value = str(row['HumanReadableValue'])
-        name = self.create_component_name(subtype, value)
+        subtype = _text_column(df, 'SubType').fillna('')
+        value = df['HumanReadableValue'].astype(str)
+        has_subtype = subtype.ne('')
+        has_value = value.ne('')
+        name = subtype.str.strip().where(has_subtype, value.str.strip())
+        name = name.where(has_subtype | has_value, 'Unknown Component')
+        name = name.mask(has_subtype & has_value, subtype.str.strip() + ' ' + value.str.strip())
 
         # Generate ID (includes sub_type to distinguish variants like Electrolytic vs Film)
-        package = str(row.get('Footprint', '')) if pd.notna(row.get('Footprint')) else ''
-        comp_id = self.generate_component_id(comp_type, subtype, value, package)
+        package = _text_column(df, 'Footprint').fillna('')
+        comp_id = _clean_id_part(comp_type)
+        for part, present in (
+            (subtype, has_subtype),
+            (value, has_value),
+            (package.str[:20], package.ne('')),  # Limit package length
+        ):
+            comp_id = comp_id.mask(present, comp_id + '_' + _clean_id_part(part))
+
+        if 'ReorderLevel' in df.columns:
+            minimum_quantity = df['ReorderLevel'].fillna(0).astype(int)
+        else:
+            minimum_quantity = 0
 
-        # Build component dict
-        component = {
+        now = datetime.now().isoformat()
+
+        # Build component records (column order matches the INSERT below)
+        components = pd.DataFrame({
             'id': comp_id,
             'type': comp_type,
             'name': name,
-            'sub_type': subtype if subtype else None,  # From CSV SubType column
+            'sub_type': subtype.where(has_subtype, None),  # From CSV SubType column
             'value': value,
             'tolerance': None,  # Not in user's CSV
-            'package': package if package else None,
+            'package': package.where(package.ne(''), None),
             'manufacturer': None,  # Not in user's CSV
-            'part_number': str(row.get('MfrPartNumber', '')) if pd.notna(row.get('MfrPartNumber')) else None,
+            'part_number': _text_column(df, 'MfrPartNumber'),
             'datasheet_url': None,  # Not in user's CSV
-            'quantity_in_stock': int(row['Quantity']),
-            'minimum_quantity': int(row.get('ReorderLevel', 0)) if pd.notna(row.get('ReorderLevel')) else 0,
+            'quantity_in_stock': df['Quantity'].astype(int),
+            'minimum_quantity': minimum_quantity,
             'unit_price': None,  # Not in user's CSV
             'location': None,  # Not in user's CSV
-            'voltage': str(row.get('Voltage', '')) if pd.notna(row.get('Voltage')) else None,
+            'voltage': _text_column(df, 'Voltage'),
             'alternatives_json': None,  # Will be populated later when alternatives exist
-            'notes': self._build_notes(row),
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
-
-        return component
-
-    def _build_notes(self, row: pd.Series) -> Optional[str]:
-        """Build notes field from CSV columns"""
-        notes_parts = []
-
-        # Add key notes (especially for ICs)
-        if pd.notna(row.get('KeyNotes')):
-            notes_parts.append(str(row['KeyNotes']))
-
-        # Add related parts
-        if pd.notna(row.get('RelatedPart')):
-            notes_parts.append(f"Related: {row['RelatedPart']}")
-
-        # Add vendor info
-        if pd.notna(row.get('Vendor')):
-            vendor = row['Vendor']
-            sku = row.get('VendorSKU', '')
-            if pd.notna(sku):
-                notes_parts.append(f"Vendor: {vendor} (SKU: {sku})")
-            else:
-                notes_parts.append(f"Vendor: {vendor}")
-
-        # Add numeric base value and unit for reference
-        if pd.notna(row.get('NumericBaseValue')) and pd.notna(row.get('UnitType')):
-            notes_parts.append(f"Numeric: {row['NumericBaseValue']} {row['UnitType']}")
-
-        return "\n".join(notes_parts) if notes_parts else None
-
-    def import_components(self, csv_path: str, preview: bool = False) -> Dict:
-        """Import components from CSV"""
-        print(f"📂 Parsing CSV file: {csv_path}")
-
-        # Parse CSV
-        df = self.parse_csv(csv_path)
-
-        print(f"✓ Found {len(df)} components")
-
-        # Transform rows
-        components = [self.transform_row(row) for _, row in df.iterrows()]
-
-        # Group by type for statistics
+            'notes': self._build_notes(df),
+            'created_at': now,
+            'updated_at': now,
+        }, index=df.index)
+
+        return components.astype(object).where(components.notna(), None).to_dict('records')
+
+    def _build_notes(self, df: pd.DataFrame) -> pd.Series:
+        """Build the notes field from CSV columns (missing where there's nothing to note)"""
+        def text(column: str) -> pd.Series:
+            return _text_column(df, column).astype('string')
+
+        vendor = 'Vendor: ' + text('Vendor')
+        # A file without a VendorSKU column still gets the SKU suffix, left empty
+        sku = text('VendorSKU') if 'VendorSKU' in df.columns else ''
+
+        parts = (
+            # Add key notes (especially for ICs)
+            text('KeyNotes'),
+            # Add related parts
+            'Related: ' + text('RelatedPart'),
+            # Add vendor info
+            (vendor + ' (SKU: ' + sku + ')').fillna(vendor),
+            # Add numeric base value and unit for reference
+            'Numeric: ' + text('NumericBaseValue') + ' ' + text('UnitType'),
+        )
+
+        # Join the present parts with newlines; NA propagates through '+'
+        notes = pd.Series(pd.NA, index=df.index, dtype='string')
+        for part in parts:
+            notes = (notes + '\n' + part).fillna(notes).fillna(part)
+
+        return notes
+
+    def import_components(self, csv_path: Union[str, IO], preview: bool = False) -> Dict:
+        """Import components from a CSV path or file object"""
+        source = csv_path if isinstance(csv_path, str) else getattr(csv_path, "name", "<stream>")
+        print(f"📂 Parsing CSV file: {source}")
+
+        if not preview:
+            print(f"💾 Importing to database: {self.db_path}")
+
+        total_components = 0
+        inserted = 0
         type_counts = {}
-        for comp in components:
-            comp_type = comp['type']
-            type_counts[comp_type] = type_counts.get(comp_type, 0) + 1
+        type_units = {}
+
+        # Parse, transform and insert chunk by chunk so memory stays bounded. One
+        # transaction and one prepared statement for the whole file; rows whose ID
+        # already exists (in the database or earlier in this file) are skipped by
+        # the conflict clause
+        with self.conn:
+            for chunk in self.iter_csv_chunks(csv_path):
+                components = self.transform(chunk)
+                total_components += len(components)
+
+                # Group by type for statistics
+                for comp in components:
+                    comp_type = comp['type']
+                    type_counts[comp_type] = type_counts.get(comp_type, 0) + 1
+                    type_units[comp_type] = type_units.get(comp_type, 0) + comp['quantity_in_stock']
+
+                if not preview:
+                    cursor = self.conn.executemany(
+                        INSERT_COMPONENT_SQL, [tuple(comp.values()) for comp in components]
+                    )
+                    inserted += cursor.rowcount
+
+        print(f"✓ Found {total_components} components")
 
         # Print preview
         print("\n📊 Inventory Preview:")
         print("=" * 60)
         for comp_type, count in sorted(type_counts.items()):
-            total_units = sum(c['quantity_in_stock'] for c in components if c['type'] == comp_type)
-            print(f"  {comp_type.upper()}: {count} types ({total_units} total units)")
+            print(f"  {comp_type.upper()}: {count} types ({type_units[comp_type]} total units)")
 
         if preview:
             print("\n⚠️  Preview mode - no changes made to database")
             return {
                 'preview': True,
-                'total_components': len(components),
+                'total_components': total_components,
                 'by_type': type_counts
             }
 
-        # Import to database
-        print(f"\n💾 Importing to database: {self.db_path}")
-
-        cursor = self.conn.cursor()
-        inserted = 0
-        skipped = 0
-
-        for comp in components:
-            try:
-                # Check if exists
-                cursor.execute("SELECT id FROM components WHERE id = ?", (comp['id'],))
-                if cursor.fetchone():
-                    print(f"  ⚠️  Skipped (exists): {comp['name']}")
-                    skipped += 1
-                    continue
-
-                # Insert
-                cursor.execute("""
-                    INSERT INTO components (
-                        id, type, name, sub_type, value, tolerance, package, manufacturer,
-                        part_number, datasheet_url, quantity_in_stock, minimum_quantity,
-                        unit_price, location, voltage, alternatives_json, notes, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    comp['id'], comp['type'], comp['name'], comp['sub_type'], comp['value'],
-                    comp['tolerance'], comp['package'], comp['manufacturer'],
-                    comp['part_number'], comp['datasheet_url'], comp['quantity_in_stock'],
-                    comp['minimum_quantity'], comp['unit_price'], comp['location'],
-                    comp['voltage'], comp['alternatives_json'], comp['notes'], comp['created_at'], comp['updated_at']
-                ))
-                inserted += 1
-
-            except Exception as e:
-                print(f"  ✗ Error importing {comp['name']}: {e}")
-
-        self.conn.commit()
+        skipped = total_components - inserted
 
         print(f"\n✅ Import complete!")
         print(f"   Inserted: {inserted}")
@@ -248,7 +297,7 @@ class InventoryImporter:
             'preview': False,
             'inserted': inserted,
             'skipped': skipped,
-            'total_components': len(components),
+            'total_components': total_components,
             'by_type': type_counts
         }
 
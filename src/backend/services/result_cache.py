@@ -0,0 +1,43 @@
+"""
+Result Cache
+Small in-process TTL cache for service read results
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    """TTL cache for query results, invalidated explicitly on writes"""
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        # Bumped by every invalidate(); a value computed across a bump may be stale
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it when missing or expired"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+
+        generation = self._generation
+        value = compute()
+        with self._lock:
+            # Don't store a result read before an invalidation landed mid-compute
+            if self._generation == generation:
+                self._entries[key] = (now, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one cached key, or everything when key is None"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
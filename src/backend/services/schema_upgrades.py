@@ -0,0 +1,40 @@
+"""
+Schema Upgrades
+Idempotent additions on top of src/db/schema.sql, applied to new and existing databases
+"""
+
+import sqlite3
+
+# Lookup indexes beyond schema.sql's originals, each replacing an index it covers:
+# - BOM reads filter on circuit_id and sort by type/value
+# - BOM validation looks components up by exact type and value
+# - the low-stock list reads its rows, already in type/value order, from a partial index
+# - part numbers are looked up exactly
+INDEX_DDL = (
+    """
+    CREATE INDEX IF NOT EXISTS idx_bom_circuit
+    ON circuit_bom(circuit_id, component_type, component_value)
+    """,
+    "DROP INDEX IF EXISTS idx_circuit_bom_circuit",
+    "CREATE INDEX IF NOT EXISTS idx_components_type_value ON components(type, value)",
+    "DROP INDEX IF EXISTS idx_components_type",
+    """
+    CREATE INDEX IF NOT EXISTS idx_components_low_stock
+    ON components(type, value) WHERE quantity_in_stock <= minimum_quantity
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_components_part_number ON components(part_number)",
+    # Retired full-text search index: its triggers taxed every component write
+    "DROP TRIGGER IF EXISTS components_fts_insert",
+    "DROP TRIGGER IF EXISTS components_fts_delete",
+    "DROP TRIGGER IF EXISTS components_fts_update",
+    "DROP TABLE IF EXISTS components_fts",
+)
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create the lookup indexes and drop the indexes they replace"""
+    with conn:
+        conn.execute("BEGIN")
+        for statement in INDEX_DDL:
+            conn.execute(statement)
+
@@ -119,9 +119,11 @@ CREATE TABLE components (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_components_type ON components(type);
+CREATE INDEX idx_components_type_value ON components(type, value);
 CREATE INDEX idx_components_value ON components(value);
 CREATE INDEX idx_components_stock ON components(quantity_in_stock);
+CREATE INDEX idx_components_low_stock ON components(type, value) WHERE quantity_in_stock <= minimum_quantity;
+CREATE INDEX idx_components_part_number ON components(part_number);
 
 -- Bill of Materials for each circuit
 CREATE TABLE circuit_bom (
@@ -140,7 +142,7 @@ CREATE TABLE circuit_bom (
     FOREIGN KEY (circuit_id) REFERENCES circuits(id) ON DELETE CASCADE
 );
 
-CREATE INDEX idx_circuit_bom_circuit ON circuit_bom(circuit_id);
+CREATE INDEX idx_bom_circuit ON circuit_bom(circuit_id, component_type, component_value);
 CREATE INDEX idx_circuit_bom_component ON circuit_bom(component_type, component_value);
 CREATE INDEX idx_circuit_bom_confidence ON circuit_bom(confidence_score);
 
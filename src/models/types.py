@@ -5,8 +5,13 @@ Complete type system for the application using Pydantic
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List, Dict, Any, Literal, Mapping, Self, Annotated, Union, Generic, TypeVar
+
+import orjson
+from pydantic.config import ConfigDict
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+from pydantic.type_adapter import TypeAdapter
 
 
 # ============================================================================
@@ -80,13 +85,33 @@ class StageStatus(str, Enum):
     BLOCKED = "blocked"
 
 
+# ============================================================================
+# DATABASE ROW MODELS
+# ============================================================================
+
+class _RowModel(BaseModel):
+    """Base for models mirroring a database table (private: not a generated interface)"""
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> Self:
+        """
+        Build from a database row without validation.
+
+        Rows were validated on the way in and match the schema, so this skips
+        pydantic-core entirely. Values keep their stored types (enum and datetime
+        columns stay str; pass warnings=False to model_dump()). Use
+        model_validate() for untrusted input such as request bodies.
+        """
+        return cls.model_construct(**dict(row))
+
+
 # ============================================================================
 # PEDALPCB CATALOG
 # ============================================================================
 
-class PedalPCBCatalogItem(BaseModel):
+class PedalPCBCatalogItem(_RowModel):
     """Pedal from PedalPCB.com catalog"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     url: str
@@ -106,9 +131,8 @@ class PedalPCBCatalogItem(BaseModel):
     updated_at: datetime
 
 
-class PedalPCBReview(BaseModel):
+class PedalPCBReview(_RowModel):
     """User review from PedalPCB.com"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     pedal_id: str
@@ -123,9 +147,8 @@ class PedalPCBReview(BaseModel):
     scraped_at: datetime
 
 
-class ScrapingJob(BaseModel):
+class ScrapingJob(_RowModel):
     """Scraping job tracking"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     job_type: Literal["catalog", "reviews", "build_docs"]
@@ -142,9 +165,8 @@ class ScrapingJob(BaseModel):
 # COMPONENTS & INVENTORY
 # ============================================================================
 
-class Component(BaseModel):
+class Component(_RowModel):
     """Electronic component in inventory"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     type: ComponentType
@@ -171,9 +193,8 @@ class Component(BaseModel):
 # CIRCUITS
 # ============================================================================
 
-class Circuit(BaseModel):
+class Circuit(_RowModel):
     """Circuit specification"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     name: str
@@ -193,9 +214,8 @@ class Circuit(BaseModel):
     updated_at: datetime
 
 
-class CircuitBOMItem(BaseModel):
+class CircuitBOMItem(_RowModel):
     """BOM item for a circuit"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     circuit_id: str
@@ -215,9 +235,8 @@ class CircuitBOMItem(BaseModel):
 # PROJECTS & WORKFLOW
 # ============================================================================
 
-class Project(BaseModel):
+class Project(_RowModel):
     """User build project"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     user_id: str
@@ -233,10 +252,13 @@ class Project(BaseModel):
     completed_at: Optional[datetime] = None
     updated_at: datetime
 
+    def color_scheme_data(self) -> Optional["ColorScheme"]:
+        """Decode the color_scheme column, or None when unset"""
+        return ColorScheme.model_validate_json(self.color_scheme) if self.color_scheme else None
+
 
-class ProjectStage(BaseModel):
+class ProjectStage(_RowModel):
     """Individual workflow stage for a project"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     project_id: str
@@ -247,6 +269,10 @@ class ProjectStage(BaseModel):
     data: Optional[str] = None  # JSON - stage-specific data
     notes: Optional[str] = None
 
+    def stage_data(self) -> Optional["StageData"]:
+        """Decode the data column, or None when the stage has no data"""
+        return decode_stage_data(self.data) if self.data else None
+
 
 # ============================================================================
 # STAGE DATA (for JSON storage)
@@ -272,6 +298,8 @@ class SpecDownloadData(BaseModel):
 
 class SchematicComponent(BaseModel):
     """Component extracted from schematic"""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     type: ComponentType
     value: str
@@ -284,6 +312,8 @@ class SchematicComponent(BaseModel):
 
 class SchematicConnection(BaseModel):
     """Connection between components"""
+    model_config = ConfigDict(frozen=True)
+
     from_component: str
     from_pin: str
     to_component: str
@@ -304,6 +334,8 @@ class SchematicAnalysisData(BaseModel):
 
 class ComponentMatch(BaseModel):
     """Inventory match result"""
+    model_config = ConfigDict(frozen=True)
+
     bom_item_id: str
     component_id: str
     quantity_needed: int
@@ -313,6 +345,8 @@ class ComponentMatch(BaseModel):
 
 class MissingComponent(BaseModel):
     """Missing component from inventory"""
+    model_config = ConfigDict(frozen=True)
+
     bom_item_id: str
     component_type: ComponentType
     component_value: str
@@ -342,6 +376,8 @@ class InventoryCheckData(BaseModel):
 
 class BOMItem(BaseModel):
     """BOM item for generation stage"""
+    model_config = ConfigDict(frozen=True)
+
     component_type: ComponentType
     component_value: str
     quantity: int
@@ -358,9 +394,30 @@ class BOMGenerationData(BaseModel):
     total_items: int
     generated_at: datetime
 
+    @classmethod
+    def from_items(cls, items: List[BOMItem], generated_at: Optional[datetime] = None) -> Self:
+        """
+        Build from a flat item list.
+
+        organized_by_type holds references to the same BOMItem instances as items
+        rather than copies, so each item is allocated once.
+        """
+        organized_by_type: Dict[str, List[BOMItem]] = {}
+        for item in items:
+            organized_by_type.setdefault(item.component_type.value, []).append(item)
+
+        return cls(
+            items=items,
+            organized_by_type=organized_by_type,
+            total_items=len(items),
+            generated_at=generated_at or datetime.now(),
+        )
+
 
 class BreadboardComponent(BaseModel):
     """Component placement on breadboard"""
+    model_config = ConfigDict(frozen=True)
+
     bom_item_id: str
     component_id: str
     reference_designator: str
@@ -373,6 +430,8 @@ class BreadboardComponent(BaseModel):
 
 class BreadboardConnection(BaseModel):
     """Wire connection on breadboard"""
+    model_config = ConfigDict(frozen=True)
+
     from_component: str
     from_pin: int
     to_component: str
@@ -400,9 +459,26 @@ class BreadboardLayoutData(BaseModel):
     png_path: Optional[str] = None
     layout_notes: Optional[str] = None
 
+    def connections_by_component(self) -> Dict[str, List[BreadboardConnection]]:
+        """
+        Index connections by each component they touch, in one pass.
+
+        Lets routing and board-crossing checks look up a component's wires
+        instead of rescanning connections per component. A wire between two pins
+        of the same component is listed once.
+        """
+        index: Dict[str, List[BreadboardConnection]] = {}
+        for connection in self.connections:
+            index.setdefault(connection.from_component, []).append(connection)
+            if connection.to_component != connection.from_component:
+                index.setdefault(connection.to_component, []).append(connection)
+        return index
+
 
 class TestResult(BaseModel):
     """Test result"""
+    model_config = ConfigDict(frozen=True)
+
     test_id: str
     test_type: Literal["power", "audio", "signal_flow", "tone"]
     passed: bool
@@ -421,6 +497,8 @@ class AudioSample(BaseModel):
 
 class Measurement(BaseModel):
     """Measurement result"""
+    model_config = ConfigDict(frozen=True)
+
     measurement_type: str
     location: str
     expected_value: str
@@ -449,6 +527,8 @@ class PrototypeTestingData(BaseModel):
 
 class AssemblyStep(BaseModel):
     """Assembly step"""
+    model_config = ConfigDict(frozen=True)
+
     step_number: int
     description: str
     completed: bool
@@ -468,6 +548,8 @@ class FinalAssemblyData(BaseModel):
 
 class DrillHole(BaseModel):
     """Drill hole specification"""
+    model_config = ConfigDict(frozen=True)
+
     x: float
     y: float
     diameter: float
@@ -505,6 +587,8 @@ class GraphicsDesignData(BaseModel):
 
 class ShowcaseImage(BaseModel):
     """Showcase image"""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     path: str
     caption: Optional[str] = None
@@ -522,13 +606,45 @@ class ShowcaseData(BaseModel):
     visibility: Literal["public", "private", "unlisted"]
 
 
+# Any stage's data, dispatched on its "type" tag (the generated StageData union)
+StageData = Annotated[
+    Union[
+        InspirationData,
+        SpecDownloadData,
+        SchematicAnalysisData,
+        InventoryCheckData,
+        BOMGenerationData,
+        BreadboardLayoutData,
+        PrototypeTestingData,
+        FinalAssemblyData,
+        GraphicsDesignData,
+        ShowcaseData,
+    ],
+    Field(discriminator="type"),
+]
+
+# Built once at import; parses and validates JSON inside pydantic-core
+STAGE_DATA_ADAPTER: TypeAdapter[StageData] = TypeAdapter(StageData)
+
+
+def decode_stage_data(data: Union[str, bytes]) -> StageData:
+    """Parse a ProjectStage.data JSON document into its stage data model"""
+    return STAGE_DATA_ADAPTER.validate_json(data)
+
+
+def encode_stage_data(stage_data: StageData) -> str:
+    """Serialize stage data for the ProjectStage.data column"""
+    # Same bytes as STAGE_DATA_ADAPTER.dump_json(), but orjson encodes the
+    # JSON-mode dump of large layouts about a quarter faster
+    return orjson.dumps(STAGE_DATA_ADAPTER.dump_python(stage_data, mode="json")).decode("utf-8")
+
+
 # ============================================================================
 # ENCLOSURES
 # ============================================================================
 
-class Enclosure(BaseModel):
+class Enclosure(_RowModel):
     """Enclosure inventory item"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     name: str
@@ -554,9 +670,12 @@ class UIPreferences(BaseModel):
     compact_mode: bool
 
 
-class UserProfile(BaseModel):
+# JSON array of vendor names stored in user_profiles.preferred_vendors
+_VENDOR_LIST_ADAPTER: TypeAdapter[List[str]] = TypeAdapter(List[str])
+
+
+class UserProfile(_RowModel):
     """User profile"""
-    model_config = ConfigDict(from_attributes=True)
 
     user_id: str
     display_name: Optional[str] = None
@@ -568,14 +687,19 @@ class UserProfile(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    def preferred_vendor_list(self) -> List[str]:
+        """Decode the preferred_vendors column (empty when unset)"""
+        if not self.preferred_vendors:
+            return []
+        return _VENDOR_LIST_ADAPTER.validate_json(self.preferred_vendors)
+
 
 # ============================================================================
 # AGENT STATE
 # ============================================================================
 
-class AgentState(BaseModel):
+class AgentState(_RowModel):
     """Agent state storage"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     scope: Literal["session", "user", "global"]
@@ -586,9 +710,8 @@ class AgentState(BaseModel):
     updated_at: datetime
 
 
-class WorkflowLog(BaseModel):
+class WorkflowLog(_RowModel):
     """Workflow execution log"""
-    model_config = ConfigDict(from_attributes=True)
 
     id: str
     project_id: Optional[str] = None
@@ -606,17 +729,20 @@ class WorkflowLog(BaseModel):
 # API TYPES
 # ============================================================================
 
-class APIResponse(BaseModel):
-    """Generic API response"""
+T = TypeVar("T")
+
+
+class APIResponse(BaseModel, Generic[T]):
+    """Generic API response; parameterize as APIResponse[Model] for a typed payload"""
     success: bool
-    data: Optional[Any] = None
+    data: Optional[T] = None
     error: Optional[str] = None
     warnings: Optional[List[str]] = None
 
 
-class PaginatedResponse(BaseModel):
-    """Paginated response"""
-    items: List[Any]
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Paginated response; parameterize as PaginatedResponse[Model] for typed items"""
+    items: List[T]
     total: int
     page: int
     page_size: int
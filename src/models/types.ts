@@ -329,7 +329,7 @@ export interface MissingComponent {
 }
 
 export interface PaginatedResponse {
-  items: Array<Any>;
+  items: Array<any>;
   total: number;
   page: number;
   page_size: number;
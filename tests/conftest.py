@@ -2,58 +2,123 @@
 Pytest configuration and fixtures.
 """
 
+import shutil
 import sqlite3
-import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Iterable
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.backend import db as db_module
 from src.backend.db import Database
 from src.backend.main import app
 
+# Read once at import; every test database starts from this schema
+_SCHEMA_SQL = (Path(__file__).parent.parent / "src" / "db" / "schema.sql").read_text()
+
+# Test databases are throwaway: skip fsync on commit. Several connections (the
+# app's pool, streamed exports, the importer) share each file, so the journal and
+# locking modes stay as in production.
+_TEST_CONNECTION_PRAGMAS = tuple(
+    "PRAGMA synchronous = OFF" if pragma.startswith("PRAGMA synchronous") else pragma
+    for pragma in db_module.CONNECTION_PRAGMAS
+)
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    """INSERT statement for a table and column set, built once per distinct pair"""
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(f':{column}' for column in columns)})"
+    )
+
+
+def insert_rows(cursor: sqlite3.Cursor, table: str, rows: Iterable[dict]) -> None:
+    """
+    Insert fixture rows given as column -> value dicts.
+
+    All rows must share the first row's keys; omitted columns take their schema defaults.
+    """
+    rows = list(rows)
+    if rows:
+        cursor.executemany(_insert_sql(table, tuple(rows[0])), rows)
+
+
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Build the schema once per session into a template database file.
+
+    Returns:
+        Path to the template database
+    """
+    template_path = tmp_path_factory.mktemp("schema") / "template.db"
+
+    conn = sqlite3.connect(str(template_path))
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(_SCHEMA_SQL)
+    conn.close()
+
+    return template_path
+
 
 @pytest.fixture
-def test_db() -> Generator[Database, None, None]:
+def test_db(
+    schema_template: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Database, None, None]:
     """
-    Create a temporary test database.
+    Create a test database from a copy of the schema template.
 
     Yields:
         Database instance with test data
     """
-    # Create temporary database
-    temp_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
-    temp_path = Path(temp_file.name)
-    temp_file.close()
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(schema_template, db_path)
 
-    # Read schema
-    schema_path = Path(__file__).parent.parent / "src" / "db" / "schema.sql"
-    schema_sql = schema_path.read_text()
+    monkeypatch.setattr(db_module, "CONNECTION_PRAGMAS", _TEST_CONNECTION_PRAGMAS)
+    db = Database(db_path)
 
-    # Initialize database
-    conn = sqlite3.connect(str(temp_path))
-    conn.executescript(schema_sql)
-    conn.close()
+    yield db
 
-    # Create Database instance
-    db = Database(temp_path)
+    db.close()
 
-    yield db
 
-    # Cleanup
-    temp_path.unlink()
+@pytest.fixture(scope="session")
+def app_client(schema_template: Path) -> Generator[TestClient, None, None]:
+    """
+    Run the app's lifespan once and share one test client for the whole session.
+
+    Entering the client keeps a single event loop running for every request,
+    rather than starting one per call.
+
+    Args:
+        schema_template: Template database; the lifespan health check runs against it
+
+    Yields:
+        Test client shared by every test
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(db_module, "CONNECTION_PRAGMAS", _TEST_CONNECTION_PRAGMAS)
+        monkeypatch.setattr(db_module, "_db_instance", Database(schema_template))
+
+        # Startup registers the routes and checks the database
+        with TestClient(app) as test_client:
+            yield test_client
 
 
 @pytest.fixture
-def client(test_db: Database) -> TestClient:
+def client(app_client: TestClient, test_db: Database) -> Generator[TestClient, None, None]:
     """
-    Create FastAPI test client with test database.
+    Point the shared test client at this test's database.
 
     Args:
+        app_client: Session test client
         test_db: Test database fixture
 
-    Returns:
+    Yields:
         Test client
     """
     # Override database dependency
@@ -64,9 +129,7 @@ def client(test_db: Database) -> TestClient:
 
     app.dependency_overrides[get_db] = override_get_db
 
-    client = TestClient(app)
-
-    yield client
+    yield app_client
 
     # Cleanup
     app.dependency_overrides.clear()
@@ -104,34 +167,7 @@ def sample_component(test_db: Database) -> dict:
     }
 
     with test_db.transaction() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO components (
-                id, type, name, sub_type, value, tolerance, package, manufacturer,
-                part_number, datasheet_url, quantity_in_stock, minimum_quantity,
-                unit_price, location, voltage, alternatives_json, notes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                component["id"],
-                component["type"],
-                component["name"],
-                component["sub_type"],
-                component["value"],
-                component["tolerance"],
-                component["package"],
-                component["manufacturer"],
-                component["part_number"],
-                component["datasheet_url"],
-                component["quantity_in_stock"],
-                component["minimum_quantity"],
-                component["unit_price"],
-                component["location"],
-                component["voltage"],
-                component["alternatives_json"],
-                component["notes"],
-            ),
-        )
+        insert_rows(cursor, "components", [component])
 
     return component
 
@@ -155,13 +191,7 @@ def sample_circuit(test_db: Database) -> dict:
     }
 
     with test_db.transaction() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO circuits (id, name, description, category)
-            VALUES (?, ?, ?, ?)
-        """,
-            (circuit["id"], circuit["name"], circuit["description"], circuit["category"]),
-        )
+        insert_rows(cursor, "circuits", [circuit])
 
     return circuit
 
@@ -203,24 +233,6 @@ def sample_bom(test_db: Database, sample_circuit: dict, sample_component: dict)
     ]
 
     with test_db.transaction() as cursor:
-        for item in bom_items:
-            cursor.execute(
-                """
-                INSERT INTO circuit_bom (
-                    id, circuit_id, component_type, component_value, quantity,
-                    reference_designator, is_critical, confidence_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    item["id"],
-                    item["circuit_id"],
-                    item["component_type"],
-                    item["component_value"],
-                    item["quantity"],
-                    item["reference_designator"],
-                    item["is_critical"],
-                    item["confidence_score"],
-                ),
-            )
+        insert_rows(cursor, "circuit_bom", bom_items)
 
     return bom_items
@@ -5,10 +5,19 @@ Tests for FastAPI endpoints.
 """
 
 import io
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.backend.db import Database
+
+# Two-component inventory in the full import format; wrap in a fresh BytesIO per upload
+_SAMPLE_INVENTORY_CSV = b"""Category,SubType,HumanReadableValue,NumericBaseValue,UnitType,Footprint,Voltage,Quantity,ReorderLevel,MfrPartNumber,KeyNotes,RelatedPart,Vendor,VendorSKU
+RESISTOR,Metal Film,10k,10000,ohm,through-hole,,50,10,,,,,
+CAPACITOR,Electrolytic,100uF,0.0001,F,radial,25V,20,5,,,,,
+"""
+
 
 class TestHealthEndpoints:
     """Test health check and root endpoints."""
@@ -30,6 +39,16 @@ class TestHealthEndpoints:
         assert "database" in data
         assert "timestamp" in data
 
+    def test_types_etag_revalidation(self, client: TestClient):
+        """Test TypeScript types endpoint answers If-None-Match with 304."""
+        response = client.get("/api/types")
+        assert response.status_code == 200
+        assert "export interface Component" in response.text
+        etag = response.headers["etag"]
+
+        response = client.get("/api/types", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
 
 class TestInventoryEndpoints:
     """Test component inventory endpoints."""
@@ -63,6 +82,11 @@ class TestInventoryEndpoints:
         data = response.json()
         assert data["total"] == 0
 
+    def test_list_components_invalid_type(self, client: TestClient):
+        """Test an unknown type filter is rejected as a bad request."""
+        response = client.get("/api/inventory/?type=flux-capacitor")
+        assert response.status_code == 400
+
     def test_search_components(self, client: TestClient, sample_component: dict):
         """Test component search."""
         response = client.get("/api/inventory/search?q=10k")
@@ -71,6 +95,34 @@ class TestInventoryEndpoints:
         assert data["total"] == 1
         assert data["components"][0]["value"] == "10k"
 
+    def test_search_components_matches_substrings(
+        self, client: TestClient, sample_component: dict
+    ):
+        """Test search matches leading and mid-word substrings."""
+        for q in ("metal", "film 1", "0k"):
+            response = client.get("/api/inventory/search", params={"q": q})
+            assert response.json()["total"] == 1, q
+
+    def test_search_components_matches_every_column(
+        self, client: TestClient, test_db: Database
+    ):
+        """Test a query matches mid-value and part number substrings alike."""
+        with test_db.transaction() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO components (id, type, name, value, part_number)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    ("diode_1n4148", "diode", "Signal diode", "1N4148", None),
+                    ("other_x", "other", "Tape reel", "x", "4148-TR"),
+                ],
+            )
+
+        response = client.get("/api/inventory/search", params={"q": "4148"})
+        ids = {component["id"] for component in response.json()["components"]}
+        assert ids == {"diode_1n4148", "other_x"}
+
     def test_search_components_no_results(self, client: TestClient):
         """Test component search with no results."""
         response = client.get("/api/inventory/search?q=nonexistent")
@@ -87,6 +139,21 @@ class TestInventoryEndpoints:
         assert data["type"] == sample_component["type"]
         assert data["value"] == sample_component["value"]
 
+    def test_get_component_etag_revalidation(self, client: TestClient, sample_component: dict):
+        """Test component reads carry an ETag and honour If-None-Match."""
+        url = f"/api/inventory/{sample_component['id']}"
+        response = client.get(url)
+        assert response.headers["cache-control"] == "private, no-cache"
+        etag = response.headers["etag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        client.patch(f"{url}/quantity", json={"delta": 1})
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
     def test_get_component_not_found(self, client: TestClient):
         """Test getting non-existent component."""
         response = client.get("/api/inventory/nonexistent")
@@ -100,6 +167,16 @@ class TestInventoryEndpoints:
         # Sample component has 50 units with min 10, so not low stock
         assert data["total"] == 0
 
+    def test_get_bootstrap(self, client: TestClient, sample_component: dict):
+        """Test the combined inventory page-load payload."""
+        response = client.get("/api/inventory/bootstrap")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["components"][0]["id"] == sample_component["id"]
+        assert data["stats"]["total_units"] == 50
+        assert data["low_stock"] == []
+
     def test_get_statistics(self, client: TestClient, sample_component: dict):
         """Test inventory statistics."""
         response = client.get("/api/inventory/stats")
@@ -128,6 +205,24 @@ class TestInventoryEndpoints:
         data = response.json()
         assert data["new_quantity"] == 40
 
+    def test_statistics_refresh_after_update(self, client: TestClient, sample_component: dict):
+        """Test cached statistics are invalidated by a quantity update."""
+        response = client.get("/api/inventory/stats")
+        assert response.json()["total_units"] == 50
+
+        client.patch(f"/api/inventory/{sample_component['id']}/quantity", json={"delta": -45})
+
+        response = client.get("/api/inventory/stats")
+        assert response.json()["total_units"] == 5
+
+        response = client.get("/api/inventory/low-stock")
+        assert response.json()["total"] == 1
+
+    def test_update_quantity_not_found(self, client: TestClient):
+        """Test updating quantity of non-existent component."""
+        response = client.patch("/api/inventory/nonexistent/quantity", json={"delta": 5})
+        assert response.status_code == 404
+
 
 class TestBOMEndpoints:
     """Test BOM management endpoints."""
@@ -189,17 +284,57 @@ class TestBOMEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["total_items"] == 2
-        assert "completeness" in data
-        assert "matches" in data
-        assert "missing" in data
+        assert data["completeness"] == 0.5
+        # 10k resistors are stocked (50 >= 2); no 100nF capacitors in inventory
+        assert [m["component"]["id"] for m in data["matches"]] == [sample_component["id"]]
+        assert data["missing"][0]["bom_item"]["component_value"] == "100nF"
+        assert data["missing"][0]["component"] is None
+
+    def test_validate_bom_refreshes_after_stock_change(
+        self, client: TestClient, sample_circuit: dict, sample_bom: list, sample_component: dict
+    ):
+        """Test cached validation is dropped when matched stock changes."""
+        url = f"/api/bom/{sample_circuit['id']}/validate"
+        assert client.get(url).json()["available_count"] == 1
+
+        # 50 - 49 = 1 resistor left, BOM needs 2
+        client.patch(f"/api/inventory/{sample_component['id']}/quantity", json={"delta": -49})
+
+        data = client.get(url).json()
+        assert data["available_count"] == 0
+        assert data["missing_count"] == 2
+
+    def test_validate_bom_uses_best_stocked_match(
+        self,
+        client: TestClient,
+        test_db: Database,
+        sample_circuit: dict,
+        sample_bom: list,
+        sample_component: dict,
+    ):
+        """Test a BOM line matching several components is validated once, against the most stock."""
+        with test_db.transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO components (id, type, name, value, quantity_in_stock, minimum_quantity)
+                VALUES ('resistor_10k_smd', 'resistor', 'SMD 10k', '10k', 80, 0)
+                """
+            )
+
+        response = client.get(f"/api/bom/{sample_circuit['id']}/validate")
+        data = response.json()
+        assert data["total_items"] == 2
+        assert [m["component"]["id"] for m in data["matches"]] == ["resistor_10k_smd"]
 
     def test_get_shopping_list(self, client: TestClient, sample_circuit: dict, sample_bom: list):
         """Test getting shopping list."""
         response = client.get(f"/api/bom/{sample_circuit['id']}/shopping-list")
         assert response.status_code == 200
         data = response.json()
-        assert "missing_items" in data
-        assert "total_missing" in data
+        assert data["total_missing"] == 1
+        assert data["missing_items"] == [
+            {"type": "capacitor", "value": "100nF", "quantity": 3, "references": ["C1", "C2", "C3"]}
+        ]
 
     def test_get_bom_stats(self, client: TestClient, sample_circuit: dict, sample_bom: list):
         """Test BOM statistics."""
@@ -218,6 +353,39 @@ class TestBOMEndpoints:
         csv_content = response.text
         assert "Type,Value,Quantity" in csv_content
         assert "10k" in csv_content
+        # Designator lists contain commas, so they must be quoted
+        assert 'resistor,10k,2,"R1,R2",Yes,0.95' in csv_content
+
+    def test_export_bom_csv_streams_from_borrowed_connection(
+        self,
+        client: TestClient,
+        test_db: Database,
+        sample_circuit: dict,
+        sample_bom: list,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test the streamed export reads through a connection lent by the pool."""
+        borrowed = []
+        borrow_connection = test_db.borrow_connection
+
+        @contextmanager
+        def recording_borrow():
+            with borrow_connection() as conn:
+                borrowed.append(conn)
+                yield conn
+
+        monkeypatch.setattr(test_db, "borrow_connection", recording_borrow)
+
+        response = client.get(f"/api/bom/{sample_circuit['id']}/export")
+        assert 'resistor,10k,2,"R1,R2",Yes,0.95' in response.text
+        assert len(borrowed) == 1
+        assert borrowed[0] in test_db._idle
+        assert borrowed[0].execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_export_empty_bom_not_found(self, client: TestClient, sample_circuit: dict):
+        """Test exporting a circuit without BOM items returns 404."""
+        response = client.get(f"/api/bom/{sample_circuit['id']}/export")
+        assert response.status_code == 404
 
 
 class TestImportEndpoints:
@@ -241,13 +409,7 @@ class TestImportEndpoints:
 
     def test_import_inventory_preview(self, client: TestClient):
         """Test importing inventory in preview mode."""
-        # Create sample CSV
-        csv_content = """Category,SubType,HumanReadableValue,NumericBaseValue,UnitType,Footprint,Voltage,Quantity,ReorderLevel,MfrPartNumber,KeyNotes,RelatedPart,Vendor,VendorSKU
-RESISTOR,Metal Film,10k,10000,ohm,through-hole,,50,10,,,,,
-CAPACITOR,Electrolytic,100uF,0.0001,F,radial,25V,20,5,,,,,
-"""
-
-        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        files = {"file": ("test.csv", io.BytesIO(_SAMPLE_INVENTORY_CSV), "text/csv")}
 
         response = client.post("/api/import/inventory?preview=true", files=files)
         assert response.status_code == 200
@@ -257,6 +419,117 @@ CAPACITOR,Electrolytic,100uF,0.0001,F,radial,25V,20,5,,,,,
         assert data["inserted"] == 0  # Preview mode
         assert "Preview complete" in data["message"]
 
+    def test_import_inventory(self, client: TestClient):
+        """Test importing inventory into the database."""
+        files = {"file": ("test.csv", io.BytesIO(_SAMPLE_INVENTORY_CSV), "text/csv")}
+
+        response = client.post("/api/import/inventory", files=files)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["inserted"] == 2
+        assert data["skipped"] == 0
+
+        response = client.get("/api/inventory/")
+        assert response.json()["total"] == 2
+
+        # Re-importing the same file skips every existing component
+        files = {"file": ("test.csv", io.BytesIO(_SAMPLE_INVENTORY_CSV), "text/csv")}
+        response = client.post("/api/import/inventory", files=files)
+        data = response.json()
+        assert data["inserted"] == 0
+        assert data["skipped"] == 2
+
+    def test_import_inventory_in_chunks(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        """Test a streamed import dedups and counts across chunk boundaries."""
+        from src.backend.services import excel_importer
+
+        monkeypatch.setattr(excel_importer, "CSV_CHUNK_ROWS", 2)
+        csv_content = """Category,SubType,HumanReadableValue,Quantity
+RESISTOR,Metal Film,10k,50
+CAPACITOR,Film,100nF,20
+,,,
+RESISTOR,Metal Film,10k,50
+"""
+
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        response = client.post("/api/import/inventory", files=files)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_components"] == 3
+        assert data["inserted"] == 2
+        assert data["skipped"] == 1
+
+    def test_import_inventory_numeric_notes_independent_of_chunks(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test NumericBaseValue notes read as written, whichever rows share a chunk."""
+        from src.backend.services import excel_importer
+
+        monkeypatch.setattr(excel_importer, "CSV_CHUNK_ROWS", 2)
+        csv_content = b"""Category,HumanReadableValue,NumericBaseValue,UnitType,Quantity
+RESISTOR,10k,10000,ohm,5
+CAPACITOR,100nF,0.0000001,F,5
+RESISTOR,4k7,4700,ohm,5
+"""
+
+        files = {"file": ("test.csv", io.BytesIO(csv_content), "text/csv")}
+        response = client.post("/api/import/inventory", files=files)
+        assert response.json()["inserted"] == 3
+
+        response = client.get("/api/inventory/resistor_10k")
+        assert response.json()["notes"] == "Numeric: 10000 ohm"
+        response = client.get("/api/inventory/resistor_4k7")
+        assert response.json()["notes"] == "Numeric: 4700 ohm"
+
+    def test_import_inventory_keeps_numeric_text(self, client: TestClient):
+        """Test numeric-looking values and part numbers import as written."""
+        csv_content = """Category,SubType,HumanReadableValue,Quantity,MfrPartNumber
+RESISTOR,Carbon Film,100,5,
+IC,,4558,2,12345
+"""
+
+        files = {"file": ("test.csv", io.BytesIO(csv_content.encode()), "text/csv")}
+        response = client.post("/api/import/inventory", files=files)
+        assert response.status_code == 200
+
+        response = client.get("/api/inventory/ic_4558")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["value"] == "4558"
+        assert data["part_number"] == "12345"
+
+    def test_failed_replace_import_refreshes_statistics(
+        self, client: TestClient, sample_component: dict
+    ):
+        """Test a replace import that fails after clearing components still drops cached stats."""
+        response = client.get("/api/inventory/stats")
+        assert response.json()["total_units"] == 50
+
+        # No Quantity column: rejected only after the replace has cleared the table
+        csv_content = b"Category,HumanReadableValue\nIC,TL072\n"
+        files = {"file": ("test.csv", io.BytesIO(csv_content), "text/csv")}
+        response = client.post("/api/import/inventory?mode=replace", files=files)
+        assert response.status_code == 400
+
+        assert client.get("/api/inventory/").json()["total"] == 0
+        response = client.get("/api/inventory/stats")
+        assert response.json()["total_units"] == 0
+
+    def test_failed_replace_import_refreshes_bom_validation(
+        self, client: TestClient, sample_circuit: dict, sample_bom: list
+    ):
+        """Test a replace import that fails after clearing components drops cached validations."""
+        url = f"/api/bom/{sample_circuit['id']}/validate"
+        assert client.get(url).json()["available_count"] == 1
+
+        # No Quantity column: rejected only after the replace has cleared the table
+        csv_content = b"Category,HumanReadableValue\nIC,TL072\n"
+        files = {"file": ("test.csv", io.BytesIO(csv_content), "text/csv")}
+        response = client.post("/api/import/inventory?mode=replace", files=files)
+        assert response.status_code == 400
+
+        assert client.get(url).json()["available_count"] == 0
+
     def test_import_inventory_invalid_file(self, client: TestClient):
         """Test importing with invalid file type."""
         files = {"file": ("test.txt", io.BytesIO(b"not a csv"), "text/plain")}
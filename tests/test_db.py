@@ -0,0 +1,51 @@
+"""
+Database Utility Tests
+
+Tests for the Database connection manager helpers.
+"""
+
+import pytest
+
+from src.backend.db import MAX_SQL_VARIABLES, Database
+
+CIRCUIT_COLUMNS = ["id", "name", "category"]
+
+# Rows per statement for CIRCUIT_COLUMNS under the SQL variable limit
+MAX_ROWS = MAX_SQL_VARIABLES // len(CIRCUIT_COLUMNS)
+
+
+class TestBulkInsert:
+    """Test multi-row inserts across statement chunk boundaries."""
+
+    @pytest.mark.parametrize("n_rows", [0, 1, MAX_ROWS, MAX_ROWS + 3])
+    def test_bulk_insert_row_counts(self, test_db: Database, n_rows: int):
+        """Test every row is inserted once, whatever the chunk split."""
+        rows = [(f"circuit_{i}", f"Circuit {i}", "fuzz") for i in range(n_rows)]
+
+        assert test_db.bulk_insert("circuits", CIRCUIT_COLUMNS, rows) == n_rows
+
+        stored = test_db.execute_query("SELECT id, name, category FROM circuits ORDER BY rowid")
+        assert [tuple(row) for row in stored] == rows
+
+    def test_bulk_insert_rejects_invalid_identifier(self, test_db: Database):
+        """Test table and column names are checked before building SQL."""
+        with pytest.raises(ValueError):
+            test_db.bulk_insert("circuits; DROP TABLE circuits", CIRCUIT_COLUMNS, [("a", "b", "c")])
+
+
+class TestTransaction:
+    """Test transaction commit and rollback."""
+
+    def test_interrupt_rolls_back(self, test_db: Database):
+        """Test a KeyboardInterrupt mid-transaction rolls back and frees the connection."""
+        with pytest.raises(KeyboardInterrupt):
+            with test_db.transaction() as cursor:
+                cursor.execute("INSERT INTO circuits (id, name) VALUES ('lost', 'Lost')")
+                raise KeyboardInterrupt
+
+        assert not test_db.get_connection().in_transaction
+        with test_db.transaction() as cursor:
+            cursor.execute("INSERT INTO circuits (id, name) VALUES ('kept', 'Kept')")
+
+        stored = test_db.execute_query("SELECT id FROM circuits")
+        assert [row["id"] for row in stored] == ["kept"]
@@ -0,0 +1,192 @@
+"""
+Model Helper Tests
+
+Tests for the helpers on the shared Pydantic models.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from src.models.types import (
+    BOMGenerationData,
+    BOMItem,
+    BreadboardConnection,
+    BreadboardLayoutData,
+    CircuitBOMItem,
+    ColorScheme,
+    ComponentType,
+    Project,
+    ProjectStage,
+    STAGE_DATA_ADAPTER,
+    ShowcaseData,
+    UserProfile,
+    encode_stage_data,
+)
+
+
+def _row(**columns) -> sqlite3.Row:
+    """A sqlite3.Row holding the given columns, as the services return them"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    names = ", ".join(f":{name} AS {name}" for name in columns)
+    row = conn.execute(f"SELECT {names}", columns).fetchone()
+    conn.close()
+    return row
+
+
+class TestRowModels:
+    """Test building row models from database rows."""
+
+    def test_from_row_keeps_stored_values(self):
+        """Test from_row() copies every column as stored, without validation."""
+        row = _row(
+            id="bom_1",
+            circuit_id="test_overdrive",
+            component_type="resistor",
+            component_value="10k",
+            quantity=2,
+            reference_designator="R1,R2",
+        )
+
+        item = CircuitBOMItem.from_row(row)
+
+        assert item.id == "bom_1"
+        assert item.quantity == 2
+        # Enum columns stay str; model_validate() would convert them
+        assert item.component_type == "resistor"
+        # Columns missing from the row take the field defaults
+        assert item.confidence_score == 1.0
+
+    def test_from_row_matches_model_validate_for_valid_rows(self):
+        """Test a valid row builds the same model either way."""
+        row = _row(
+            id="bom_1",
+            circuit_id="test_overdrive",
+            component_type="capacitor",
+            component_value="100nF",
+            quantity=3,
+        )
+
+        constructed = CircuitBOMItem.from_row(row).model_dump(mode="json", warnings=False)
+        assert constructed == CircuitBOMItem.model_validate(dict(row)).model_dump(mode="json")
+
+
+class TestJSONColumns:
+    """Test typed accessors for JSON text columns."""
+
+    def test_color_scheme_data(self):
+        """Test the color_scheme column decodes to a ColorScheme, or None when unset."""
+        project = Project.from_row(
+            _row(id="p1", color_scheme='{"base_color": "#000", "text_color": "#fff"}')
+        )
+        assert project.color_scheme_data() == ColorScheme(base_color="#000", text_color="#fff")
+
+        assert Project.from_row(_row(id="p2", color_scheme=None)).color_scheme_data() is None
+
+    def test_color_scheme_data_rejects_invalid_json(self):
+        """Test a malformed color scheme is reported rather than half-decoded."""
+        project = Project.from_row(_row(id="p1", color_scheme='{"base_color": "#000"}'))
+        with pytest.raises(ValidationError):
+            project.color_scheme_data()
+
+    def test_preferred_vendor_list(self):
+        """Test the preferred_vendors column decodes to a list, empty when unset."""
+        profile = UserProfile.from_row(_row(user_id="u1", preferred_vendors='["Mouser", "Tayda"]'))
+        assert profile.preferred_vendor_list() == ["Mouser", "Tayda"]
+
+        for unset in (None, ""):
+            profile = UserProfile.from_row(_row(user_id="u2", preferred_vendors=unset))
+            assert profile.preferred_vendor_list() == []
+
+
+class TestBOMGenerationData:
+    """Test building BOM generation stage data."""
+
+    def test_from_items_groups_shared_instances(self):
+        """Test items are grouped by type value, sharing the instances in items."""
+        items = [
+            BOMItem(
+                component_type=comp_type,
+                component_value=value,
+                quantity=1,
+                reference_designators=[ref],
+                in_stock=True,
+            )
+            for comp_type, value, ref in (
+                (ComponentType.RESISTOR, "10k", "R1"),
+                (ComponentType.CAPACITOR, "100nF", "C1"),
+                (ComponentType.RESISTOR, "1k", "R2"),
+            )
+        ]
+        generated_at = datetime(2024, 1, 1)
+
+        data = BOMGenerationData.from_items(items, generated_at)
+
+        assert data.total_items == 3
+        assert data.generated_at == generated_at
+        assert list(data.organized_by_type) == ["resistor", "capacitor"]
+        assert data.organized_by_type["resistor"][0] is data.items[0]
+        assert data.organized_by_type["resistor"][1] is data.items[2]
+        assert data.organized_by_type["capacitor"] == [items[1]]
+
+    def test_from_items_empty(self):
+        """Test an empty BOM has no groups."""
+        data = BOMGenerationData.from_items([])
+        assert data.items == []
+        assert data.organized_by_type == {}
+        assert data.total_items == 0
+
+
+class TestBreadboardLayoutData:
+    """Test breadboard layout lookups."""
+
+    def test_connections_by_component(self):
+        """Test each wire is listed under both ends, and once for a same-component wire."""
+        wires = [
+            BreadboardConnection(from_component="R1", from_pin=1, to_component="C1", to_pin=2),
+            BreadboardConnection(from_component="C1", from_pin=1, to_component="IC1", to_pin=3),
+            BreadboardConnection(from_component="IC1", from_pin=4, to_component="IC1", to_pin=8),
+        ]
+        layout = BreadboardLayoutData(
+            layout_id="layout_1",
+            platform="dual_board_custom",
+            components=[],
+            connections=wires,
+            power_config={"voltage": 9.0, "jumper_connections": {}, "potentiometer_slots": []},
+        )
+
+        index = layout.connections_by_component()
+
+        assert index == {
+            "R1": [wires[0]],
+            "C1": [wires[0], wires[1]],
+            "IC1": [wires[1], wires[2]],
+        }
+
+
+class TestStageDataEncoding:
+    """Test stage data serialization for the ProjectStage.data column."""
+
+    @pytest.fixture
+    def showcase(self) -> ShowcaseData:
+        """Showcase stage data with a nested image and a datetime"""
+        return ShowcaseData(
+            post_id="post_1",
+            title="Fuzz build",
+            description="Finished fuzz",
+            images=[{"id": "img_1", "path": "/img/1.png", "display_order": 1}],
+            published_at=datetime(2024, 5, 1, 12, 30),
+            visibility="public",
+        )
+
+    def test_encode_matches_adapter_dump_json(self, showcase: ShowcaseData):
+        """Test the orjson encoding is byte-for-byte pydantic's JSON."""
+        assert encode_stage_data(showcase) == STAGE_DATA_ADAPTER.dump_json(showcase).decode()
+
+    def test_encoded_data_round_trips_through_stage(self, showcase: ShowcaseData):
+        """Test encoded data decodes back to an equal model via ProjectStage.stage_data()."""
+        stage = ProjectStage.from_row(_row(id="s1", data=encode_stage_data(showcase)))
+        assert stage.stage_data() == showcase
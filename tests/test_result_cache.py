@@ -0,0 +1,40 @@
+"""
+Result Cache Tests
+
+Tests for the service-level TTL result cache.
+"""
+
+from src.backend.services.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Test caching and invalidation of computed results."""
+
+    def test_caches_until_invalidated(self):
+        """Test a value is computed once, then again after invalidate()."""
+        cache = ResultCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("stats", compute) == 1
+        assert cache.get_or_compute("stats", compute) == 1
+
+        cache.invalidate()
+        assert cache.get_or_compute("stats", compute) == 2
+
+    def test_invalidate_during_compute_discards_result(self):
+        """Test a result computed across an invalidate() is returned but not cached."""
+        cache = ResultCache()
+        values = iter(["stale", "fresh"])
+
+        def compute_racing_a_write():
+            value = next(values)
+            # A write lands after the read, before the result is stored
+            cache.invalidate()
+            return value
+
+        assert cache.get_or_compute("stats", compute_racing_a_write) == "stale"
+        assert cache.get_or_compute("stats", lambda: next(values)) == "fresh"